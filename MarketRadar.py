@@ -410,6 +410,7 @@ import logging
 import warnings
 import socket
 import market_core
+import market_shard
 
 # ================= 稳定性增强设置 =================
 _original_request = requests.Session.request
@@ -500,9 +501,21 @@ TARGETS_CUSTOM_SELECTION = {
     "华夏恒生科技ETF联接":   {"ak": "013403", "yf": "513180.SH", "type": "etf_zh"}, 
 }
 
-def get_all_kline_data():
+# 定义所有任务组 (字典, 组名, MA类型)
+KLINE_GROUPS = [
+    (TARGETS_INDICES, "全球核心指数", "general"),
+    (TARGETS_COMMODITIES, "大宗商品", "commodities"),
+    (TARGETS_TECH_HK, "港股科技", "general"),
+    (TARGETS_US_GIANTS, "美股巨头", "general"),
+    # 🎯 关键修复：加入了自定义精选组
+    (TARGETS_CUSTOM_SELECTION, "自定义精选", "general") 
+]
+
+def get_all_kline_data(shard_index=None, shard_count=None, strategy="hash"):
     """
     执行所有K线抓取任务
+    shard_index/shard_count: 分片模式，仅抓取第 shard_index 片 (共 shard_count 片) 的标的
+    strategy: 分片策略 "hash" (按名称哈希) 或 "cost" (按预估耗时均衡)
     """
     print(f"📅 MarketRadar 启动抓取...")
     
@@ -520,17 +533,14 @@ def get_all_kline_data():
     }
     all_status_logs = []
 
-    # 定义所有任务组 (字典, 组名, MA类型)
-    groups = [
-        (TARGETS_INDICES, "全球核心指数", "general"),
-        (TARGETS_COMMODITIES, "大宗商品", "commodities"),
-        (TARGETS_TECH_HK, "港股科技", "general"),
-        (TARGETS_US_GIANTS, "美股巨头", "general"),
-        # 🎯 关键修复：加入了自定义精选组
-        (TARGETS_CUSTOM_SELECTION, "自定义精选", "general") 
-    ]
+    groups = KLINE_GROUPS
+    if shard_count:
+        groups = market_shard.select_shard(KLINE_GROUPS, shard_index, shard_count, strategy)
+        print(f"🧩 分片模式: 第 {shard_index + 1}/{shard_count} 片 ({strategy}), 共 {sum(len(t) for t, _, _ in groups)} 个标的")
 
     for targets, group_name, ma_type in groups:
+        if not targets:
+            continue
         data, ma, logs = market_core.fetch_group_data(fetcher, targets, group_name, REPORT_START_DATE, END_DATE)
         
         # 存入数据
@@ -0,0 +1,217 @@
+#!/usr/bin/env python
+# -*- coding:utf-8 -*-
+"""
+按主机自动调节并发度 (Concurrency Autotuner)
+功能：根据每个主机的响应延迟、错误率以及 429/403 限流信号，在配置的上下限内
+动态增减并发数 (AIMD: 无异常时 +1，被限流时减半)，并将调优结果持久化到状态目录，下次运行沿用。
+"""
+
+import os
+import re
+import json
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from urllib.parse import urlparse
+from zoneinfo import ZoneInfo
+
+import utils
+
+TZ_CN = ZoneInfo("Asia/Shanghai")
+STATE_FILENAME = "concurrency_tuner.json"
+
+# 主机 -> (最小并发, 最大并发, 初始并发)
+HOST_BOUNDS = {
+    # K线 (AkShare / YFinance)
+    "sina.com.cn": (1, 8, 3),
+    "eastmoney.com": (1, 8, 3),
+    "yahoo.com": (1, 4, 2),
+    # 宏观 (Selenium)
+    "investing.com": (1, 3, 1),
+    "cnn.com": (1, 2, 1),
+    "cboe.com": (1, 2, 1),
+    "gurufocus.com": (1, 2, 1),
+    "sse.net.cn": (1, 2, 1),
+    # 宏观接口/HTTP 直连 (不占浏览器，与同一主机的 Selenium 抓取分开计数)
+    "http:eastmoney.com": (1, 6, 3),
+    "http:investing.com": (1, 4, 2),
+    "http:cnn.com": (1, 2, 1),
+    "http:cboe.com": (1, 2, 1),
+}
+DEFAULT_BOUNDS = (1, 4, 2)
+HTTP_PREFIX = "http:"
+
+WINDOW_SIZE = 4            # 每累计 N 次观测调整一次
+ERROR_RATE_LIMIT = 0.5     # 窗口内错误率超过该值则 -1
+LATENCY_SLOWDOWN = 2.0     # 窗口延迟中位数超过基线的倍数则 -1
+LATENCY_EWMA_ALPHA = 0.3
+
+THROTTLE_PATTERN = re.compile(
+    r"\b(429|403)\b|too many requests|rate ?limit|forbidden|access denied|just a moment",
+    re.IGNORECASE,
+)
+
+def host_key(url_or_host):
+    """归一化为注册域名: cn.investing.com -> investing.com, www.sse.net.cn -> sse.net.cn"""
+    host = urlparse(url_or_host).netloc if "://" in url_or_host else url_or_host
+    labels = host.split(":")[0].lower().strip(".").split(".")
+    if len(labels) >= 3 and len(labels[-1]) == 2 and labels[-2] in ("com", "net", "org", "gov", "edu"):
+        return ".".join(labels[-3:])
+    return ".".join(labels[-2:])
+
+def http_key(url_or_host):
+    """纯 HTTP 任务的调优键: 与浏览器抓取同一主机时也独立计数，不受浏览器池并发限制"""
+    return HTTP_PREFIX + host_key(url_or_host)
+
+def is_throttle_error(error):
+    return bool(error) and bool(THROTTLE_PATTERN.search(str(error)))
+
+def _parse_env_bounds():
+    """MARKETRADAR_CONCURRENCY_BOUNDS="investing.com=1:2,http:investing.com=2:4" 覆盖默认上下限"""
+    overrides = {}
+    raw = os.environ.get("MARKETRADAR_CONCURRENCY_BOUNDS", "")
+    for item in raw.split(","):
+        try:
+            host, bounds = item.split("=")
+            lo, hi = [int(x) for x in bounds.split(":")]
+            overrides[host.strip()] = (lo, hi, lo)
+        except ValueError:
+            continue
+    return overrides
+
+class ConcurrencyTuner:
+    def __init__(self, state_file=None, bounds=None):
+        self.state_file = state_file or utils.state_path(STATE_FILENAME)
+        self.bounds = dict(HOST_BOUNDS)
+        self.bounds.update(_parse_env_bounds())
+        if bounds:
+            self.bounds.update(bounds)
+
+        self.cond = threading.Condition()
+        self.limits = {}
+        self.inflight = {}
+        self.baseline = {}
+        self.window = {}
+        self.saturated = set()
+        self._load()
+
+    def _bounds(self, host):
+        return self.bounds.get(host, DEFAULT_BOUNDS)
+
+    def _clamp(self, host, value):
+        lo, hi, _ = self._bounds(host)
+        return max(lo, min(hi, int(value)))
+
+    def _load(self):
+        if not os.path.exists(self.state_file):
+            return
+        try:
+            with open(self.state_file, 'r', encoding='utf-8') as f:
+                saved = json.load(f)
+            for host, item in saved.get("hosts", {}).items():
+                self.limits[host] = self._clamp(host, item.get("limit", self._bounds(host)[2]))
+                if item.get("latency"):
+                    self.baseline[host] = float(item["latency"])
+        except Exception as e:
+            print(f"⚠️ 并发调优状态读取失败: {e}")
+
+    def save(self):
+        with self.cond:
+            hosts = {
+                host: {"limit": limit, "latency": self.baseline.get(host)}
+                for host, limit in self.limits.items()
+            }
+        payload = {"updated_at": datetime.now(TZ_CN).strftime("%Y-%m-%d %H:%M:%S"), "hosts": hosts}
+        try:
+            tmp_path = self.state_file + ".tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(payload, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.state_file)
+        except Exception as e:
+            print(f"⚠️ 并发调优状态写入失败: {e}")
+
+    def limit(self, host):
+        with self.cond:
+            if host not in self.limits:
+                self.limits[host] = self._clamp(host, self._bounds(host)[2])
+            return self.limits[host]
+
+    def max_workers(self, hosts, cap=None):
+        """线程池大小: 各主机并发上限之和 (调优过程中可能增长到上限)"""
+        total = sum(self._bounds(host)[1] for host in set(hosts)) or 1
+        return min(total, cap) if cap else total
+
+    @contextmanager
+    def slot(self, host):
+        """占用主机的一个并发名额，超出当前上限时阻塞等待"""
+        self.limit(host)
+        with self.cond:
+            while self.inflight.get(host, 0) >= self.limits[host]:
+                self.cond.wait()
+            self.inflight[host] = self.inflight.get(host, 0) + 1
+            # 只有并发名额被用满过，才有必要继续扩容
+            if self.inflight[host] >= self.limits[host]:
+                self.saturated.add(host)
+        try:
+            yield
+        finally:
+            with self.cond:
+                self.inflight[host] -= 1
+                self.cond.notify_all()
+
+    def record(self, host, latency, ok=True, throttled=False):
+        with self.cond:
+            window = self.window.setdefault(host, [])
+            window.append((latency, ok, throttled))
+            # 被限流时立即收缩，不等待窗口填满
+            if throttled or len(window) >= WINDOW_SIZE:
+                self._adjust(host)
+                self.cond.notify_all()
+
+    def _adjust(self, host):
+        window = self.window.pop(host, [])
+        saturated = host in self.saturated
+        self.saturated.discard(host)
+        if not window:
+            return
+        current = self.limits.get(host) or self._clamp(host, self._bounds(host)[2])
+        latencies = sorted(lat for lat, ok, _ in window if ok)
+        errors = sum(1 for _, ok, _ in window if not ok)
+        throttled = any(t for _, _, t in window)
+        median = latencies[len(latencies) // 2] if latencies else None
+        baseline = self.baseline.get(host)
+
+        if throttled:
+            new_limit = current // 2
+            reason = "限流"
+        elif errors / len(window) >= ERROR_RATE_LIMIT:
+            new_limit = current - 1
+            reason = "错误率过高"
+        elif median is not None and baseline and median > baseline * LATENCY_SLOWDOWN:
+            new_limit = current - 1
+            reason = "延迟升高"
+        elif errors == 0 and saturated:
+            new_limit = current + 1
+            reason = "运行平稳"
+        else:
+            new_limit = current
+            reason = None
+
+        if median is not None and not throttled:
+            self.baseline[host] = median if baseline is None else (1 - LATENCY_EWMA_ALPHA) * baseline + LATENCY_EWMA_ALPHA * median
+
+        new_limit = self._clamp(host, new_limit)
+        if new_limit != current:
+            print(f"   🎛️ [{host}] 并发 {current} -> {new_limit} ({reason})")
+        self.limits[host] = new_limit
+
+_TUNER = None
+_TUNER_LOCK = threading.Lock()
+
+def get_tuner():
+    """进程内共享的调优器实例"""
+    global _TUNER
+    with _TUNER_LOCK:
+        if _TUNER is None:
+            _TUNER = ConcurrencyTuner()
+        return _TUNER
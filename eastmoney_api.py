@@ -0,0 +1,153 @@
+# eastmoney_api.py
+# -----------------------------------------------------------------------------
+# DeepSeek Finance Project - Eastmoney Datacenter JSON Adapters
+# data.eastmoney.com/cjsj/*.html 页面的表格由 datacenter-web.eastmoney.com 接口渲染，
+# 这里直接请求 JSON (服务端分页 + 日期过滤)，输出与 fetch_generic_source 相同的记录格式
+# -----------------------------------------------------------------------------
+
+import time
+import pandas as pd
+import fetch_data_core
+import selenium_utils
+import page_archive
+
+API_URL = "https://datacenter-web.eastmoney.com/api/data/v1/get"
+PAGE_SIZE = 50
+MAX_PAGES = 10
+TIMEOUT = 10
+
+# 接口失败时尽快回退到 Selenium，不做过多重试
+SESSION = fetch_data_core.get_retry_session(retries=2)
+
+# 数据源名称 -> 接口配置
+# label: 页面首列 (月份/日期) 对应的字段; date_field: 服务端过滤/排序字段
+# columns: 接口字段 -> 页面表头 (与 fetch_generic_source 展平后的列名一致)
+ADAPTERS = {
+    "中国_CPI": {
+        "report": "RPT_ECONOMY_CPI",
+        "date_field": "REPORT_DATE",
+        "label": ("TIME", "月份"),
+        "columns": {
+            "NATIONAL_BASE": "全国当月", "NATIONAL_SAME": "全国同比增长",
+            "NATIONAL_SEQUENTIAL": "全国环比增长", "NATIONAL_ACCUMULATE": "全国累计",
+            "CITY_BASE": "城市当月", "CITY_SAME": "城市同比增长",
+            "CITY_SEQUENTIAL": "城市环比增长", "CITY_ACCUMULATE": "城市累计",
+            "RURAL_BASE": "农村当月", "RURAL_SAME": "农村同比增长",
+            "RURAL_SEQUENTIAL": "农村环比增长", "RURAL_ACCUMULATE": "农村累计",
+        },
+    },
+    "中国_PMI": {
+        "report": "RPT_ECONOMY_PMI",
+        "date_field": "REPORT_DATE",
+        "label": ("TIME", "月份"),
+        "columns": {
+            "MAKE_INDEX": "制造业指数", "MAKE_SAME": "制造业同比增长",
+            "NMAKE_INDEX": "非制造业指数", "NMAKE_SAME": "非制造业同比增长",
+        },
+    },
+    "中国_PPI": {
+        "report": "RPT_ECONOMY_PPI",
+        "date_field": "REPORT_DATE",
+        "label": ("TIME", "月份"),
+        "columns": {
+            "BASE": "当月", "BASE_SAME": "当月同比增长", "BASE_ACCUMULATE": "累计",
+        },
+    },
+    "中国_货币供应量": {
+        "report": "RPT_ECONOMY_CURRENCY_SUPPLY",
+        "date_field": "REPORT_DATE",
+        "label": ("TIME", "月份"),
+        "columns": {
+            "BASIC_CURRENCY": "货币和准货币(M2)数量(亿元)",
+            "BASIC_CURRENCY_SAME": "货币和准货币(M2)同比增长",
+            "BASIC_CURRENCY_SEQUENTIAL": "货币和准货币(M2)环比增长",
+            "CURRENCY": "货币(M1)数量(亿元)",
+            "CURRENCY_SAME": "货币(M1)同比增长",
+            "CURRENCY_SEQUENTIAL": "货币(M1)环比增长",
+            "FREE_CASH": "流通中的现金(M0)数量(亿元)",
+            "FREE_CASH_SAME": "流通中的现金(M0)同比增长",
+            "FREE_CASH_SEQUENTIAL": "流通中的现金(M0)环比增长",
+        },
+    },
+    "中国_LPR": {
+        "report": "RPTA_WEB_RATE",
+        "date_field": "TRADE_DATE",
+        "label": ("TRADE_DATE", "日期"),
+        "columns": {
+            "LPR1Y": "1年期LPR(%)", "LPR5Y": "5年期以上LPR(%)",
+            "RATE_1": "短期贷款利率:6个月至1年(含)(%)", "RATE_2": "中长期贷款利率:5年以上(%)",
+        },
+    },
+}
+
+def _fetch_pages(report, date_field, start_date):
+    rows = []
+    for page in range(1, MAX_PAGES + 1):
+        params = {
+            "reportName": report,
+            "columns": "ALL",
+            "filter": f"({date_field}>='{start_date}')",
+            "pageNumber": str(page), "pageSize": str(PAGE_SIZE),
+            "sortColumns": date_field, "sortTypes": "-1",
+            "source": "WEB", "client": "WEB",
+        }
+        r = SESSION.get(API_URL, params=params, timeout=TIMEOUT)
+        r.raise_for_status()
+        payload = r.json()
+        result = payload.get("result")
+        if not result or not result.get("data"):
+            if page == 1:
+                raise ValueError(f"接口无数据: {payload.get('message')}")
+            break
+        rows.extend(result["data"])
+        if page >= (result.get("pages") or 1):
+            break
+    return rows
+
+def _rows_to_records(name, rows, days_to_keep):
+    """接口原始行 -> 与页面表格相同列名的记录 (可由 page_archive 重放)"""
+    config = ADAPTERS[name]
+    cutoff_date = pd.Timestamp.now() - pd.Timedelta(days=days_to_keep)
+    label_field, label_col = config["label"]
+    df = pd.DataFrame(rows)
+    missing = [c for c in [label_field] + list(config["columns"]) if c not in df.columns]
+    if missing:
+        raise ValueError(f"接口字段缺失: {missing}")
+
+    df = df[[label_field] + list(config["columns"])].rename(columns={label_field: label_col, **config["columns"]})
+    if label_col == "日期":
+        df[label_col] = pd.to_datetime(df[label_col]).dt.strftime('%Y-%m-%d')
+
+    df['_std_date'] = df[label_col].apply(selenium_utils.clean_date)
+    df = df.dropna(subset=['_std_date'])
+    df = df[df['_std_date'] >= cutoff_date]
+    df['_std_date'] = df['_std_date'].dt.strftime('%Y-%m-%d')
+    if df.empty:
+        raise ValueError("过滤后无有效数据")
+
+    df = df.astype(object).where(pd.notnull(df), None)
+    if '日期' not in df.columns:
+        df['日期'] = df['_std_date']
+
+    return df.to_dict('records')
+
+def fetch_indicator(name, days_to_keep=180):
+    """
+    通过 JSON 接口获取单个 cjsj 指标
+    返回: (name, records, error_msg)，与 Selenium scraper 一致
+    """
+    config = ADAPTERS[name]
+    start = time.time()
+    try:
+        cutoff_date = pd.Timestamp.now() - pd.Timedelta(days=days_to_keep)
+        # 月度数据的 REPORT_DATE 为当月 1 日，向前多取一个月避免边界遗漏，最终仍按 cutoff 过滤
+        start_date = (cutoff_date - pd.Timedelta(days=31)).strftime('%Y-%m-%d')
+        rows = _fetch_pages(config["report"], config["date_field"], start_date)
+
+        page_archive.record(name, _rows_to_records, (name, rows, days_to_keep))
+        records = _rows_to_records(name, rows, days_to_keep)
+        print(f"⚡ [{name}] 接口直连成功! 获得 {len(records)} 条记录 ({time.time() - start:.2f}s)")
+        return name, records, None
+    except Exception as e:
+        print(f"⚠️ [{name}] 接口直连失败: {str(e)[:100]}")
+        return name, [], str(e)
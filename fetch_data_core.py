@@ -17,6 +17,8 @@ from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 from zoneinfo import ZoneInfo
 
+import investing_client
+
 warnings.filterwarnings("ignore")
 
 ALPHA_VANTAGE_KEY = os.environ.get("ALPHA_VANTAGE_KEY", "DEMO")
@@ -141,11 +143,10 @@ def fetch_japan_bond_yields():
     print("   -> 获取日本国债数据 (Investing.com)...")
     url = "https://cn.investing.com/rates-bonds/japan-government-bonds"
     try:
-        r = SESSION.get(url, timeout=TIMEOUT)
-        r.raise_for_status()
+        html = investing_client.get_html(url, timeout=TIMEOUT, latch=False)
         
         try:
-            dfs = pd.read_html(StringIO(r.text))
+            dfs = pd.read_html(StringIO(html))
         except ValueError as ve:
             return [], f"No tables found in response: {ve}"
 
@@ -213,13 +214,12 @@ def fetch_vietnam_index_klines():
     print("   -> 获取越南胡志明指数K线 (Investing.com)...")
     url = "https://cn.investing.com/indices/vn-historical-data"
     try:
-        r = SESSION.get(url, timeout=TIMEOUT)
-        r.raise_for_status()
+        html = investing_client.get_html(url, timeout=TIMEOUT, latch=False)
         
         try:
-            dfs = pd.read_html(StringIO(r.text))
+            dfs = pd.read_html(StringIO(html))
         except ValueError as ve:
-             print(f"   [Debug] Read HTML failed. Response preview: {r.text[:200]}...")
+             print(f"   [Debug] Read HTML failed. Response preview: {html[:200]}...")
              return [], f"Read HTML failed: {ve}"
 
         if not dfs:
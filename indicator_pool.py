@@ -0,0 +1,145 @@
+#!/usr/bin/env python
+# -*- coding:utf-8 -*-
+"""
+技术指标计算进程池 (Indicator Process Pool)
+功能：将 utils.calculate_ma 与 market_core.calculate_tech_indicators 这类 pandas 计算密集型任务 (或 indicator_state 增量推进)
+从网络 I/O 线程中剥离，放到独立的进程池执行，避免与网络线程争抢 GIL。
+K线数据通过 multiprocessing.shared_memory 传递 (date 为 int64 纳秒，OHLC 为 float64)，只回传摘要结果。
+"""
+
+import os
+import sys
+import atexit
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, Future
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+OHLC_COLS = ['open', 'close', 'high', 'low']
+
+# MARKETRADAR_INDICATOR_WORKERS=0 时退化为在当前线程内计算
+_env_workers = os.environ.get("MARKETRADAR_INDICATOR_WORKERS")
+MAX_WORKERS = int(_env_workers) if _env_workers is not None else min(4, os.cpu_count() or 1)
+
+_EXECUTOR = None
+_EXECUTOR_LOCK = threading.Lock()
+
+def compute_summary(name, df):
+    """
+    计算单个标的的均线 + 技术指标摘要
+    优先从持久化的增量状态推进新增K线 (indicator_state)，不可用时全量计算
+    """
+    import indicator_state
+
+    if indicator_state.ENABLED:
+        try:
+            summary = indicator_state.compute_summary(name, df)
+            if summary is not None:
+                return summary
+        except Exception as e:
+            print(f"   ⚠️ [{name}] 增量指标计算失败，改为全量计算: {e}")
+    return full_summary(name, df)
+
+def full_summary(name, df):
+    """在完整K线序列上计算均线 + 技术指标摘要 (与原 fetch_group_data 内联逻辑一致)"""
+    import utils
+    import market_core
+
+    ma_info_list = utils.calculate_ma(df)
+    ma_info = ma_info_list[0] if ma_info_list else None
+
+    tech_indicators = market_core.calculate_tech_indicators(df)
+    if ma_info:
+        ma_info.update(tech_indicators)
+    return ma_info
+
+def _attach_shared_memory(shm_name):
+    # 子进程只读取不负责释放，避免 resource_tracker 在子进程退出时误删共享内存
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=shm_name, track=False)
+    from multiprocessing import resource_tracker
+    register = resource_tracker.register
+    resource_tracker.register = lambda *args, **kwargs: None
+    try:
+        return shared_memory.SharedMemory(name=shm_name)
+    finally:
+        resource_tracker.register = register
+
+def _compute_from_shared(name, shm_name, n_rows):
+    """进程池 worker: 从共享内存重建 K线并计算摘要"""
+    shm = _attach_shared_memory(shm_name)
+    try:
+        dates = np.ndarray((n_rows,), dtype=np.int64, buffer=shm.buf).copy()
+        values = np.ndarray((len(OHLC_COLS), n_rows), dtype=np.float64, buffer=shm.buf, offset=n_rows * 8).copy()
+    finally:
+        shm.close()
+
+    df = pd.DataFrame({'date': pd.to_datetime(dates), 'name': name})
+    for i, col in enumerate(OHLC_COLS):
+        df[col] = values[i]
+    return compute_summary(name, df)
+
+def _shutdown():
+    global _EXECUTOR
+    if _EXECUTOR is not None:
+        _EXECUTOR.shutdown(wait=False, cancel_futures=True)
+        _EXECUTOR = None
+
+def _get_executor():
+    global _EXECUTOR
+    with _EXECUTOR_LOCK:
+        if _EXECUTOR is None and MAX_WORKERS > 0:
+            # 主进程此时已有大量 I/O 线程，避免直接 fork
+            if "forkserver" in multiprocessing.get_all_start_methods():
+                ctx = multiprocessing.get_context("forkserver")
+            else:
+                ctx = multiprocessing.get_context("spawn")
+            _EXECUTOR = ProcessPoolExecutor(max_workers=MAX_WORKERS, mp_context=ctx)
+            atexit.register(_shutdown)
+        return _EXECUTOR
+
+def _done_future(name, df):
+    future = Future()
+    try:
+        future.set_result(compute_summary(name, df))
+    except Exception as e:
+        future.set_exception(e)
+    return future
+
+def submit(name, df):
+    """
+    提交单个标的的指标计算，返回 Future (结果为 ma_info 或 None)
+    进程池不可用时直接在当前线程计算
+    """
+    executor = _get_executor()
+    if executor is None or df is None or df.empty:
+        return _done_future(name, df)
+
+    n_rows = len(df)
+    shm = None
+    try:
+        shm = shared_memory.SharedMemory(create=True, size=n_rows * 8 * (1 + len(OHLC_COLS)))
+        dates = np.ndarray((n_rows,), dtype=np.int64, buffer=shm.buf)
+        dates[:] = pd.to_datetime(df['date']).values.astype('datetime64[ns]').astype(np.int64)
+        values = np.ndarray((len(OHLC_COLS), n_rows), dtype=np.float64, buffer=shm.buf, offset=n_rows * 8)
+        for i, col in enumerate(OHLC_COLS):
+            values[i] = pd.to_numeric(df[col], errors='coerce').to_numpy(dtype=np.float64)
+        del dates, values
+
+        future = executor.submit(_compute_from_shared, name, shm.name, n_rows)
+    except Exception as e:
+        print(f"   ⚠️ 指标进程池不可用，改为本地计算: {e}")
+        if shm is not None:
+            shm.close()
+            shm.unlink()
+        return _done_future(name, df)
+
+    def _release(_):
+        shm.close()
+        shm.unlink()
+
+    future.add_done_callback(_release)
+    return future
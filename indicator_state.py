@@ -0,0 +1,498 @@
+#!/usr/bin/env python
+# -*- coding:utf-8 -*-
+"""
+增量技术指标状态 (Incremental Indicator State)
+功能：均线 (MA5~MA250) 与 MACD / KDJ / RSI 背后的 EMA 链按K线逐根递推，状态按标的持久化到状态目录，
+之后每次运行只需推进新增的K线，计算量与新K线数量成正比，而不是与历史长度成正比。
+
+- RollingWindow: 定长环形缓冲区，维护滚动和/平方和 (MA/STD) 与单调队列 (HHV/LLV)
+- EMAState: 与 pandas ewm(adjust=False) 逐点一致的递推 (MyTT 的 EMA / SMA)
+- SymbolIndicators: 单个标的的全部状态，summary() 输出与 utils.calculate_ma + market_core.calculate_tech_indicators 相同的摘要
+
+最后一根K线可能是盘中未定稿数据，只在内存中临时推进，持久化的状态截止到倒数第二根；
+下次运行时若状态的最后一根K线在新数据中不存在或收盘价不同 (如复权价格调整)，整体重建。
+full_values() 用 MyTT / pandas 在完整序列上重新计算，供 verify() 核对增量结果。
+"""
+
+import os
+import copy
+import json
+import math
+import hashlib
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+import utils
+
+# MARKETRADAR_INDICATOR_STATE=0 关闭增量状态 (每次全量计算)
+ENABLED = os.environ.get("MARKETRADAR_INDICATOR_STATE", "1") != "0"
+# MARKETRADAR_INDICATOR_VERIFY=1 每个标的同时做全量计算核对，不一致时丢弃状态并使用全量结果
+VERIFY = os.environ.get("MARKETRADAR_INDICATOR_VERIFY", "0") == "1"
+
+STATE_SUBDIR = "indicator_state"
+STATE_VERSION = 1
+MA_WINDOWS = [5, 10, 20, 60, 120, 250]
+VERIFY_REL_TOL = 1e-6
+
+def _isnan(x):
+    return x is None or x != x
+
+class RollingWindow:
+    """
+    最近 n 个值的滚动统计，与 pandas rolling(n) 一致: 不足 n 个或窗口内有 NaN 时结果为 NaN
+    extrema=True 时额外维护单调队列，HHV/LLV 摊还 O(1)
+    """
+    def __init__(self, n, extrema=False):
+        self.n = n
+        self.extrema = extrema
+        self.values = deque(maxlen=n)
+        self.seq = 0            # 已推入的值个数 (单调队列用于判断过期)
+        self.total = 0.0
+        self.total_sq = 0.0
+        self.nan_count = 0
+        self.since_resync = 0
+        self.max_queue = deque()    # (seq, value)，值递减
+        self.min_queue = deque()    # (seq, value)，值递增
+
+    def push(self, x):
+        x = float(x)
+        if len(self.values) == self.n:
+            old = self.values[0]
+            if _isnan(old):
+                self.nan_count -= 1
+            else:
+                self.total -= old
+                self.total_sq -= old * old
+        self.values.append(x)
+        if _isnan(x):
+            self.nan_count += 1
+        else:
+            self.total += x
+            self.total_sq += x * x
+            if self.extrema:
+                while self.max_queue and self.max_queue[-1][1] <= x:
+                    self.max_queue.pop()
+                self.max_queue.append((self.seq, x))
+                while self.min_queue and self.min_queue[-1][1] >= x:
+                    self.min_queue.pop()
+                self.min_queue.append((self.seq, x))
+        self.seq += 1
+        if self.extrema:
+            for queue in (self.max_queue, self.min_queue):
+                while queue and queue[0][0] <= self.seq - 1 - self.n:
+                    queue.popleft()
+
+        # 加减累积的舍入误差每 n 次重新求和清零
+        self.since_resync += 1
+        if self.since_resync >= self.n:
+            self._resync()
+
+    def _resync(self):
+        finite = [v for v in self.values if not _isnan(v)]
+        self.total = math.fsum(finite)
+        self.total_sq = math.fsum(v * v for v in finite)
+        self.since_resync = 0
+
+    @property
+    def ready(self):
+        return len(self.values) == self.n and self.nan_count == 0
+
+    def mean(self):
+        return self.total / self.n if self.ready else math.nan
+
+    def std(self):
+        """总体标准差 (ddof=0，与 MyTT.STD 一致)"""
+        if not self.ready:
+            return math.nan
+        mean = self.total / self.n
+        return math.sqrt(max(self.total_sq / self.n - mean * mean, 0.0))
+
+    def max(self):
+        return self.max_queue[0][1] if self.ready else math.nan
+
+    def min(self):
+        return self.min_queue[0][1] if self.ready else math.nan
+
+    def to_dict(self):
+        return {"n": self.n, "extrema": self.extrema, "values": list(self.values), "seq": self.seq}
+
+    @classmethod
+    def from_dict(cls, data):
+        window = cls(data["n"], data["extrema"])
+        window.values.extend(float(v) for v in data["values"])
+        window.nan_count = sum(1 for v in window.values if _isnan(v))
+        window._resync()
+        window.seq = data["seq"]
+        if window.extrema:
+            # 按原顺序重放窗口内的值重建单调队列 (窗口很短)
+            start = window.seq - len(window.values)
+            for i, v in enumerate(window.values):
+                if _isnan(v):
+                    continue
+                while window.max_queue and window.max_queue[-1][1] <= v:
+                    window.max_queue.pop()
+                window.max_queue.append((start + i, v))
+                while window.min_queue and window.min_queue[-1][1] >= v:
+                    window.min_queue.pop()
+                window.min_queue.append((start + i, v))
+        return window
+
+    def copy(self):
+        window = copy.copy(self)
+        window.values = self.values.copy()
+        window.max_queue = self.max_queue.copy()
+        window.min_queue = self.min_queue.copy()
+        return window
+
+class EMAState:
+    """pandas ewm(alpha, adjust=False).mean() 的逐点递推 (ignore_na=False, min_periods=0)"""
+    def __init__(self, alpha, weighted=math.nan, old_wt=1.0):
+        self.alpha = alpha
+        self.weighted = weighted
+        self.old_wt = old_wt
+
+    @classmethod
+    def span(cls, n):
+        """MyTT.EMA(S, N): alpha = 2 / (N + 1)"""
+        return cls(2 / (n + 1))
+
+    @classmethod
+    def sma(cls, n, m=1):
+        """MyTT.SMA(S, N, M): alpha = M / N"""
+        return cls(m / n)
+
+    def update(self, x):
+        x = float(x)
+        is_observation = not _isnan(x)
+        if not _isnan(self.weighted):
+            # 缺失值不更新结果，但旧值权重继续衰减
+            self.old_wt *= 1 - self.alpha
+            if is_observation:
+                if self.weighted != x:
+                    self.weighted = (self.old_wt * self.weighted + self.alpha * x) / (self.old_wt + self.alpha)
+                self.old_wt = 1.0
+        elif is_observation:
+            self.weighted = x
+        return self.weighted
+
+    @property
+    def value(self):
+        return self.weighted
+
+    def copy(self):
+        return EMAState(self.alpha, self.weighted, self.old_wt)
+
+    def to_dict(self):
+        return {"alpha": self.alpha, "weighted": self.weighted, "old_wt": self.old_wt}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data["alpha"], data["weighted"], data["old_wt"])
+
+def _rd(x, digits=3):
+    """MyTT.RD"""
+    return float(np.round(x, digits))
+
+def _div(a, b):
+    """与 numpy 数组除法一致: 除以 0 得到 inf / nan 而不抛异常"""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return float(np.float64(a) / np.float64(b))
+
+class SymbolIndicators:
+    """单个标的的全部指标状态: MA5~MA250、MACD(12,26,9)、KDJ(9,3,3)、RSI(6)"""
+    def __init__(self, ma_windows=MA_WINDOWS):
+        self.ma = {w: RollingWindow(w) for w in ma_windows}
+        self.ema_short = EMAState.span(12)
+        self.ema_long = EMAState.span(26)
+        self.dea = EMAState.span(9)
+        self.hhv = RollingWindow(9, extrema=True)
+        self.llv = RollingWindow(9, extrema=True)
+        self.k = EMAState.span(3 * 2 - 1)
+        self.d = EMAState.span(3 * 2 - 1)
+        self.rsi_up = EMAState.sma(6)
+        self.rsi_abs = EMAState.sma(6)
+        self.bars = 0
+        self.last_date = None       # ISO 格式日期
+        self.last_close = math.nan
+        self.prev_close = math.nan
+        # 当前与上一根K线的输出 (判断金叉/死叉)
+        self.out = {}
+        self.prev_out = {}
+
+    def update(self, date, high, low, close):
+        """推进一根K线"""
+        close, high, low = float(close), float(high), float(low)
+        for window in self.ma.values():
+            window.push(close)
+
+        # MACD: DIF = EMA12 - EMA26, DEA = EMA(DIF, 9)，MyTT 输出保留 3 位小数
+        dif = self.ema_short.update(close) - self.ema_long.update(close)
+        dea = self.dea.update(dif)
+
+        # KDJ: RSV = (C - LLV(L, 9)) / (HHV(H, 9) - LLV(L, 9)) * 100
+        self.hhv.push(high)
+        self.llv.push(low)
+        rsv = _div(close - self.llv.min(), self.hhv.max() - self.llv.min()) * 100
+        k = self.k.update(rsv)
+        d = self.d.update(k)
+
+        # RSI: DIF = C - REF(C, 1)，首根K线为 NaN
+        change = close - self.last_close
+        up = self.rsi_up.update(np.maximum(change, 0))
+        total = self.rsi_abs.update(abs(change))
+
+        self.prev_out = self.out
+        self.out = {
+            "DIF": dif, "DEA": dea, "MACD": (dif - dea) * 2,
+            "K": k, "D": d, "J": k * 3 - d * 2,
+            "RSI6": _div(up, total) * 100,
+        }
+        self.bars += 1
+        self.last_date = pd.Timestamp(date).isoformat()
+        self.prev_close, self.last_close = self.last_close, close
+
+    def values(self):
+        """当前未舍入的指标值 (与 full_values 对应，用于核对)"""
+        values = {f"MA{w}": window.mean() for w, window in self.ma.items()}
+        values.update(self.out)
+        return values
+
+    def summary(self, name, date_val):
+        """
+        与 indicator_pool.compute_summary 全量路径相同的摘要:
+        utils.calculate_ma 的 名称/日期/收盘价/涨跌幅/N日均线 + market_core.calculate_tech_indicators 的结果
+        """
+        if isinstance(date_val, pd.Timestamp):
+            date_str = date_val.strftime('%Y-%m-%d')
+        else:
+            date_str = str(date_val)
+
+        change_pct = 0.0
+        prev_close, curr_close = np.float64(self.prev_close), np.float64(self.last_close)
+        if prev_close > 0:
+            change_pct = round((curr_close - prev_close) / prev_close * 100, 2)
+
+        summary = {
+            "名称": name,
+            "日期": date_str,
+            "收盘价": round(float(curr_close), 2),
+            "涨跌幅": f"{change_pct}%"
+        }
+        for w, window in self.ma.items():
+            latest_ma = np.float64(window.mean())
+            summary[f"{w}日均线"] = round(latest_ma, 2) if pd.notna(latest_ma) else None
+
+        summary.update(self._tech_summary())
+        return summary
+
+    def _tech_summary(self):
+        cur, prev = self.out, self.prev_out
+        dif, dea, macd = _rd(cur["DIF"]), _rd(cur["DEA"]), _rd(cur["MACD"])
+        rsi6 = _rd(cur["RSI6"])
+
+        signals = []
+        if prev:
+            prev_dif, prev_dea = _rd(prev["DIF"]), _rd(prev["DEA"])
+            if prev_dif < prev_dea and dif > dea:
+                signals.append("MACD金叉")
+            elif prev_dif > prev_dea and dif < dea:
+                signals.append("MACD死叉")
+            if prev["K"] < prev["D"] and cur["K"] > cur["D"]:
+                signals.append("KDJ金叉")
+        if rsi6 > 80:
+            signals.append("RSI超买")
+        elif rsi6 < 20:
+            signals.append("RSI超卖")
+        if not signals:
+            signals.append("无特殊技术形态")
+
+        return {
+            "MACD": round(macd, 4),
+            "DIF": round(dif, 4),
+            "DEA": round(dea, 4),
+            "K": round(cur["K"], 2),
+            "D": round(cur["D"], 2),
+            "J": round(cur["J"], 2),
+            "RSI6": round(rsi6, 2),
+            "Signals": signals
+        }
+
+    EMA_FIELDS = ("ema_short", "ema_long", "dea", "k", "d", "rsi_up", "rsi_abs")
+
+    def copy(self):
+        """推进临时K线前的副本 (比 deepcopy 快一个数量级)"""
+        state = copy.copy(self)
+        state.ma = {w: window.copy() for w, window in self.ma.items()}
+        state.hhv, state.llv = self.hhv.copy(), self.llv.copy()
+        for key in self.EMA_FIELDS:
+            setattr(state, key, getattr(self, key).copy())
+        return state
+
+    def to_dict(self):
+        return {
+            "version": STATE_VERSION,
+            "bars": self.bars, "last_date": self.last_date,
+            "last_close": self.last_close, "prev_close": self.prev_close,
+            "ma": {str(w): window.to_dict() for w, window in self.ma.items()},
+            "hhv": self.hhv.to_dict(), "llv": self.llv.to_dict(),
+            "ema": {key: getattr(self, key).to_dict() for key in self.EMA_FIELDS},
+            "out": self.out, "prev_out": self.prev_out,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        state = cls(ma_windows=[int(w) for w in data["ma"]])
+        state.bars, state.last_date = data["bars"], data["last_date"]
+        state.last_close, state.prev_close = data["last_close"], data["prev_close"]
+        state.ma = {int(w): RollingWindow.from_dict(window) for w, window in data["ma"].items()}
+        state.hhv, state.llv = RollingWindow.from_dict(data["hhv"]), RollingWindow.from_dict(data["llv"])
+        for key, ema in data["ema"].items():
+            setattr(state, key, EMAState.from_dict(ema))
+        state.out, state.prev_out = data["out"], data["prev_out"]
+        return state
+
+def _state_file(name):
+    # 标的名称可能含 "/" 等字符，按哈希命名
+    digest = hashlib.sha1(str(name).encode("utf-8")).hexdigest()[:16]
+    return utils.state_path(STATE_SUBDIR, f"{digest}.json")
+
+def load(name):
+    path = _state_file(name)
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get("version") != STATE_VERSION or data.get("name") != name:
+            return None
+        return SymbolIndicators.from_dict(data)
+    except Exception as e:
+        print(f"   ⚠️ [{name}] 指标状态读取失败，将重建: {e}")
+        return None
+
+def save(name, state):
+    try:
+        path = _state_file(name)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"name": name, **state.to_dict()}, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+    except Exception as e:
+        print(f"   ⚠️ [{name}] 指标状态写入失败: {e}")
+
+def discard(name):
+    try:
+        os.remove(_state_file(name))
+    except OSError:
+        pass
+
+def _sorted_bars(df):
+    """按日期排序后的 (日期数组, DataFrame)；缺少 OHLC 列时返回 None (交由全量路径处理)"""
+    if df is None or df.empty or not {'date', 'close', 'high', 'low'}.issubset(df.columns):
+        return None
+    dates = df['date'] if pd.api.types.is_datetime64_any_dtype(df['date']) else pd.to_datetime(df['date'])
+    if not dates.is_monotonic_increasing:
+        order = np.argsort(dates.to_numpy(), kind='stable')
+        df, dates = df.iloc[order], dates.iloc[order]
+    return dates.to_numpy(), df
+
+def _numeric(df, col, start=0):
+    return pd.to_numeric(df[col].iloc[start:], errors='coerce').to_numpy(dtype=float)
+
+def _continues(state, dates, df, committed):
+    """状态的最后一根K线仍在已定稿部分中且收盘价未变时，返回应继续推进的位置；否则返回 None (重建)"""
+    if state is None or state.last_date is None:
+        return None
+    matches = np.flatnonzero(dates[:committed] == np.datetime64(pd.Timestamp(state.last_date)))
+    if len(matches) != 1:
+        return None
+    i = matches[0]
+    close = _numeric(df, 'close', i)[0]
+    same = close == state.last_close or (_isnan(close) and _isnan(state.last_close))
+    return i + 1 if same else None
+
+def advance(name, df, persist=True):
+    """
+    读取标的状态并推进到 df 的最后一根K线，返回 (SymbolIndicators, 最后一根K线的原始日期值, 推进的K线数)
+    倒数第二根及之前的K线推进后持久化；无法衔接时从 df 第一根K线重建
+    """
+    bars = _sorted_bars(df)
+    if bars is None:
+        return None, None, 0
+    dates, df = bars
+    committed = len(dates) - 1
+
+    state = load(name)
+    start = _continues(state, dates, df, committed)
+    if start is None:
+        state, start = SymbolIndicators(), 0
+
+    # 只转换需要推进的K线
+    highs, lows, closes = (_numeric(df, col, start) for col in ('high', 'low', 'close'))
+    for i in range(committed - start):
+        state.update(dates[start + i], highs[i], lows[i], closes[i])
+    if persist and start < committed:
+        save(name, state)
+
+    final = state.copy()
+    final.update(dates[-1], highs[-1], lows[-1], closes[-1])
+    return final, df['date'].iloc[-1], len(dates) - start
+
+def full_values(df, ma_windows=MA_WINDOWS):
+    """全量路径: 用 MyTT / pandas 在完整序列上计算最后一根K线的未舍入指标值"""
+    import MyTT
+    df = df.sort_values('date')
+    CLOSE = pd.to_numeric(df['close'], errors='coerce').to_numpy(dtype=float)
+    HIGH = pd.to_numeric(df['high'], errors='coerce').to_numpy(dtype=float)
+    LOW = pd.to_numeric(df['low'], errors='coerce').to_numpy(dtype=float)
+
+    values = {f"MA{w}": MyTT.MA(CLOSE, w)[-1] for w in ma_windows}
+    DIF = MyTT.EMA(CLOSE, 12) - MyTT.EMA(CLOSE, 26)
+    DEA = MyTT.EMA(DIF, 9)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        RSV = (CLOSE - MyTT.LLV(LOW, 9)) / (MyTT.HHV(HIGH, 9) - MyTT.LLV(LOW, 9)) * 100
+        K = MyTT.EMA(RSV, 5)
+        D = MyTT.EMA(K, 5)
+        CHANGE = CLOSE - MyTT.REF(CLOSE, 1)
+        RSI6 = MyTT.SMA(MyTT.MAX(CHANGE, 0), 6) / MyTT.SMA(MyTT.ABS(CHANGE), 6) * 100
+    values.update({
+        "DIF": DIF[-1], "DEA": DEA[-1], "MACD": (DIF[-1] - DEA[-1]) * 2,
+        "K": K[-1], "D": D[-1], "J": K[-1] * 3 - D[-1] * 2, "RSI6": RSI6[-1],
+    })
+    return {k: float(v) for k, v in values.items()}
+
+def compare(incremental, full, rel_tol=VERIFY_REL_TOL):
+    """返回不一致的指标 {名称: (增量值, 全量值)}，两边同为 NaN 视为一致"""
+    mismatches = {}
+    for key, expected in full.items():
+        actual = incremental.get(key, math.nan)
+        if _isnan(actual) and _isnan(expected):
+            continue
+        if not math.isclose(actual, expected, rel_tol=rel_tol, abs_tol=rel_tol):
+            mismatches[key] = (actual, expected)
+    return mismatches
+
+def verify(name, df):
+    """用全量计算核对该标的当前的增量状态 (不写入状态)"""
+    final, _, _ = advance(name, df, persist=False)
+    if final is None:
+        return {}
+    return compare(final.values(), full_values(df))
+
+def compute_summary(name, df, verify_full=VERIFY):
+    """
+    增量路径的指标摘要 (结构与 indicator_pool.compute_summary 全量路径一致)
+    返回 None 表示无法使用增量状态 (数据缺列 / 核对不一致)，调用方应改用全量计算
+    """
+    final, date_val, _ = advance(name, df)
+    if final is None:
+        return None
+    if verify_full:
+        mismatches = compare(final.values(), full_values(df))
+        if mismatches:
+            print(f"   ⚠️ [{name}] 增量指标与全量计算不一致，丢弃状态: {mismatches}")
+            discard(name)
+            return None
+    return final.summary(name, date_val)
@@ -0,0 +1,123 @@
+#!/usr/bin/env python
+# -*- coding:utf-8 -*-
+"""
+Investing.com 轻量 HTTP 客户端 (Investing Client)
+功能：以浏览器请求头 + 持久化 Cookie 直接请求服务端渲染的页面，识别 Cloudflare/验证码等拦截页。
+被拦截时抛出 InvestingBlocked，由调用方升级到 Selenium；有浏览器回退的调用方 (latch=True) 在同一主机
+本次运行内被拦截后不再重复尝试，没有回退的调用方 (Step 1 的国债/K线) 不受该记录影响，并做更多重试。
+"""
+
+import os
+import json
+import threading
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+import utils
+
+TIMEOUT = 15
+COOKIE_FILENAME = "investing_cookies.json"
+
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8",
+    "Accept-Language": "zh-CN,zh;q=0.9,en;q=0.8",
+    "Cache-Control": "no-cache",
+    "Upgrade-Insecure-Requests": "1",
+    "Sec-Fetch-Dest": "document",
+    "Sec-Fetch-Mode": "navigate",
+    "Sec-Fetch-Site": "same-origin",
+}
+
+# 503 多为临时故障，按普通错误重试，不视为拦截
+BLOCK_STATUS = (403, 429)
+BLOCK_MARKERS = [
+    "just a moment", "cf-chl", "challenge-platform", "attention required",
+    "captcha", "enable javascript and cookies", "access denied",
+]
+
+class InvestingBlocked(Exception):
+    """请求被拦截 (需要浏览器才能通过)"""
+
+def _build_session(retries, backoff_factor, cookies=None):
+    session = requests.Session()
+    session.headers.update(HEADERS)
+    if cookies is not None:
+        session.cookies = cookies
+    # 拦截状态码不重试，直接交给调用方
+    retry = Retry(total=retries, backoff_factor=backoff_factor, status_forcelist=[500, 502, 503, 504])
+    session.mount('https://', HTTPAdapter(max_retries=retry))
+    session.mount('http://', HTTPAdapter(max_retries=retry))
+    return session
+
+# 有 Selenium 回退: 少量重试后尽快升级到浏览器
+SESSION = _build_session(retries=2, backoff_factor=0.5)
+# 无回退 (Step 1 直接请求): 与 fetch_data_core.SESSION 相同的重试强度，共享 Cookie
+PATIENT_SESSION = _build_session(retries=5, backoff_factor=1, cookies=SESSION.cookies)
+_LOCK = threading.Lock()
+_BLOCKED_HOSTS = set()
+_COOKIES_LOADED = False
+
+def _load_cookies():
+    global _COOKIES_LOADED
+    with _LOCK:
+        if _COOKIES_LOADED:
+            return
+        _COOKIES_LOADED = True
+        path = utils.state_path(COOKIE_FILENAME)
+        if not os.path.exists(path):
+            return
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                for item in json.load(f):
+                    SESSION.cookies.set(item["name"], item["value"], domain=item.get("domain", ""), path=item.get("path", "/"))
+        except Exception as e:
+            print(f"⚠️ Investing Cookie 读取失败: {e}")
+
+def _save_cookies():
+    cookies = [
+        {"name": c.name, "value": c.value, "domain": c.domain, "path": c.path}
+        for c in SESSION.cookies if "investing.com" in c.domain
+    ]
+    try:
+        path = utils.state_path(COOKIE_FILENAME)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(cookies, f)
+        os.replace(tmp_path, path)
+    except Exception as e:
+        print(f"⚠️ Investing Cookie 写入失败: {e}")
+
+def is_block_page(status_code, text):
+    if status_code in BLOCK_STATUS:
+        return True
+    head = text[:5000].lower()
+    return any(marker in head for marker in BLOCK_MARKERS) and "<table" not in text.lower()
+
+def get_html(url, timeout=TIMEOUT, latch=True):
+    """
+    请求页面 HTML；被拦截时抛出 InvestingBlocked
+    latch: 调用方有浏览器回退时为 True，主机被拦截后本次运行内跳过后续直连；
+           无回退的调用方传 False，每次都实际请求 (并使用重试更多的会话)，也不记录拦截
+    """
+    host = urlparse(url).netloc
+    if latch and host in _BLOCKED_HOSTS:
+        raise InvestingBlocked(f"{host} 本次运行已被拦截，跳过 HTTP 直连")
+
+    _load_cookies()
+    referer = f"{urlparse(url).scheme}://{host}/"
+    session = SESSION if latch else PATIENT_SESSION
+    r = session.get(url, headers={"Referer": referer}, timeout=timeout)
+    if is_block_page(r.status_code, r.text):
+        if latch:
+            with _LOCK:
+                _BLOCKED_HOSTS.add(host)
+        raise InvestingBlocked(f"HTTP {r.status_code}: 触发拦截页 ({host})")
+    r.raise_for_status()
+
+    with _LOCK:
+        _save_cookies()
+    return r.text
@@ -0,0 +1,164 @@
+#!/usr/bin/env python
+# -*- coding:utf-8 -*-
+"""
+盘中实时轮询守护进程 (Intraday Live Daemon)
+功能：常驻内存，只轮询盘中敏感的数据源 (科创50实时量比、科创50/恒生科技 60分钟K线)，
+并将结果写入报告中的 "实时" 小节，无需重跑包含 Selenium 的完整流程。
+
+用法:
+    python live_daemon.py [--interval 30] [--bars-interval 300] [--always] [--once]
+"""
+
+import os
+import sys
+import json
+import time
+import signal
+import argparse
+import threading
+from datetime import datetime, time as dtime
+from zoneinfo import ZoneInfo
+
+import fetch_data_core
+import main as radar_main
+
+TZ_CN = ZoneInfo("Asia/Shanghai")
+LIVE_FILENAME = "MarketRadar_Live.json"
+LIVE_SECTION_KEY = "实时"
+
+# 交易时段 (北京时间)，非交易时段默认不轮询
+TRADING_SESSIONS = {
+    "cn": [(dtime(9, 30), dtime(11, 30)), (dtime(13, 0), dtime(15, 0))],
+    "hk": [(dtime(9, 30), dtime(12, 0)), (dtime(13, 0), dtime(16, 0))],
+}
+
+def _spot_source():
+    data, err = fetch_data_core.fetch_star50_realtime_vol_ratio()
+    return ([data] if data else []), err
+
+# 轮询源配置: 名称 -> (抓取函数, 所属市场, 间隔类型)
+LIVE_SOURCES = {
+    "科创50实时快照": (_spot_source, "cn", "spot"),
+    "科创50_60分钟K线": (fetch_data_core.fetch_kcb50_60m, "cn", "bars"),
+    "恒生科技指数_60m": (fetch_data_core.fetch_hstech_60m, "hk", "bars"),
+}
+
+def in_trading_session(market, now=None):
+    now = now or datetime.now(TZ_CN)
+    if now.weekday() >= 5:
+        return False
+    t = now.time()
+    return any(start <= t <= end for start, end in TRADING_SESSIONS.get(market, []))
+
+class LiveDaemon:
+    def __init__(self, spot_interval=30, bars_interval=300, only_trading_hours=True,
+                 report_path=radar_main.OUTPUT_FILENAME, live_path=LIVE_FILENAME):
+        self.intervals = {"spot": spot_interval, "bars": bars_interval}
+        self.only_trading_hours = only_trading_hours
+        self.report_path = report_path
+        self.live_path = live_path
+        self.stop_event = threading.Event()
+
+        # 内存中的状态: 名称 -> {data, updated_at, error, last_poll}
+        self.state = {name: {"data": [], "updated_at": None, "error": None, "last_poll": 0.0} for name in LIVE_SOURCES}
+
+    def _due_sources(self, now_ts, force=False):
+        due = []
+        for name, (_, market, kind) in LIVE_SOURCES.items():
+            if not force:
+                if self.only_trading_hours and not in_trading_session(market):
+                    continue
+                if now_ts - self.state[name]["last_poll"] < self.intervals[kind]:
+                    continue
+            due.append(name)
+        return due
+
+    def poll_once(self, force=False):
+        """轮询到期的数据源，返回本轮是否有数据更新"""
+        changed = False
+        for name in self._due_sources(time.time(), force=force):
+            fetch_func = LIVE_SOURCES[name][0]
+            entry = self.state[name]
+            entry["last_poll"] = time.time()
+            try:
+                data, err = fetch_func()
+            except Exception as e:
+                data, err = [], str(e)
+
+            if data:
+                if data != entry["data"]:
+                    changed = True
+                entry["data"] = data
+                entry["error"] = None
+                entry["updated_at"] = datetime.now(TZ_CN).strftime("%Y-%m-%d %H:%M:%S")
+                print(f"   ✅ [{name}] 已刷新 ({len(data)} 条)")
+            else:
+                # 失败时保留上一次成功的数据
+                entry["error"] = err
+                print(f"   ❌ [{name}] 刷新失败: {str(err)[:100]}")
+        return changed
+
+    def build_section(self):
+        section = {"更新时间": datetime.now(TZ_CN).strftime("%Y-%m-%d %H:%M:%S")}
+        for name, entry in self.state.items():
+            section[name] = entry["data"]
+        section["状态"] = {
+            name: {"updated_at": entry["updated_at"], "error": entry["error"]}
+            for name, entry in self.state.items()
+        }
+        return radar_main.clean_and_round(section)
+
+    def _write_json(self, path, data):
+        tmp_path = path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, cls=radar_main.NpEncoder, indent=None)
+        os.replace(tmp_path, path)
+
+    def publish(self):
+        section = self.build_section()
+        try:
+            self._write_json(self.live_path, section)
+        except Exception as e:
+            print(f"❌ 实时数据写入失败: {e}")
+
+        # 若完整报告已存在，仅替换其中的实时小节
+        if os.path.exists(self.report_path):
+            try:
+                with open(self.report_path, 'r', encoding='utf-8') as f:
+                    report = json.load(f)
+                report[LIVE_SECTION_KEY] = section
+                self._write_json(self.report_path, report)
+            except Exception as e:
+                print(f"⚠️ 报告实时小节更新失败: {e}")
+
+    def run(self, once=False):
+        print(f"📡 实时轮询启动 (spot={self.intervals['spot']}s, bars={self.intervals['bars']}s)...")
+        self.poll_once(force=True)
+        self.publish()
+        if once:
+            return
+
+        while not self.stop_event.is_set():
+            if self.poll_once():
+                self.publish()
+            self.stop_event.wait(min(self.intervals.values()) / 2)
+        print("🛑 实时轮询已停止")
+
+    def stop(self, *args):
+        self.stop_event.set()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="MarketRadar 盘中实时轮询")
+    parser.add_argument("--interval", type=int, default=30, help="实时快照轮询间隔 (秒)")
+    parser.add_argument("--bars-interval", type=int, default=300, help="60分钟K线轮询间隔 (秒)")
+    parser.add_argument("--always", action="store_true", help="非交易时段也继续轮询")
+    parser.add_argument("--once", action="store_true", help="只刷新一次后退出")
+    args = parser.parse_args(argv)
+
+    daemon = LiveDaemon(args.interval, args.bars_interval, only_trading_hours=not args.always)
+    signal.signal(signal.SIGINT, daemon.stop)
+    signal.signal(signal.SIGTERM, daemon.stop)
+    daemon.run(once=args.once)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,200 @@
+#!/usr/bin/env python
+# -*- coding:utf-8 -*-
+"""
+按发布日历缓存月度/周度宏观指标 (Release-Calendar Cache)
+功能：CPI、PMI、非农等指标每月最多更新一次。抓取到新数据后缓存到状态目录，
+在下一个预期发布日之前直接复用；到达发布日后每次运行都重新抓取，直到出现新一期数据为止。
+未配置发布规则的数据源 (BDI、SKEW、Put/Call、恐惧贪婪等日频数据) 不缓存。
+"""
+
+import os
+import json
+import threading
+from datetime import datetime, date, timedelta
+from zoneinfo import ZoneInfo
+
+import utils
+
+TZ_CN = ZoneInfo("Asia/Shanghai")
+CACHE_FILENAME = "macro_cache.json"
+MAX_CACHE_AGE_DAYS = 45   # 无论发布规则如何，超过该天数强制刷新
+
+# MARKETRADAR_MACRO_CACHE=0 关闭缓存，每次全量抓取
+CACHE_ENABLED = os.environ.get("MARKETRADAR_MACRO_CACHE", "1") != "0"
+
+# 数据源名称 -> 预期发布规则 (北京时间日期，海外数据按公布次日前后均会被轮询覆盖)
+# ("monthly", d): 每月 d 日 (d 超过当月天数时取月末)
+# ("business_day", n): 每月第 n 个工作日
+# ("nth_weekday", weekday, n): 每月第 n 个星期 weekday (0=周一)
+# ("weekly", weekday): 每周 weekday
+# ("interval", days): 距上次出现新数据 days 天后 (议息会议等不规则日程)
+RELEASE_SCHEDULE = {
+    "中国_CPI": ("monthly", 9),
+    "中国_PPI": ("monthly", 9),
+    "中国_PMI": ("monthly", 31),
+    "中国_货币供应量": ("monthly", 10),
+    "中国_LPR": ("monthly", 20),
+    "美国_ISM制造业PMI": ("business_day", 1),
+    "美国_ISM非制造业指数": ("business_day", 3),
+    "USA_ISM_New_Orders": ("business_day", 1),
+    "美国_非农就业": ("nth_weekday", 4, 1),
+    "美国_核心零售销售月率": ("monthly", 14),
+    "美国_利率决议": ("interval", 35),
+    "日本_央行利率决议": ("interval", 35),
+    "USA_Initial_Jobless": ("weekly", 3),
+    "CCFI_运价指数": ("weekly", 4),
+}
+
+def _month_days(year, month):
+    nxt = date(year + (month == 12), month % 12 + 1, 1)
+    return (nxt - timedelta(days=1)).day
+
+def _release_in_month(rule, year, month):
+    kind = rule[0]
+    if kind == "monthly":
+        return date(year, month, min(rule[1], _month_days(year, month)))
+    if kind == "business_day":
+        d, count = date(year, month, 1), 0
+        while True:
+            if d.weekday() < 5:
+                count += 1
+                if count == rule[1]:
+                    return d
+            d += timedelta(days=1)
+    if kind == "nth_weekday":
+        first = date(year, month, 1)
+        offset = (rule[1] - first.weekday()) % 7
+        return first + timedelta(days=offset + 7 * (rule[2] - 1))
+    raise ValueError(f"未知发布规则: {rule}")
+
+def next_release(rule, after):
+    """返回晚于 after 的下一个预期发布日"""
+    kind = rule[0]
+    if kind == "weekly":
+        return after + timedelta(days=(rule[1] - after.weekday() - 1) % 7 + 1)
+    if kind == "interval":
+        return after + timedelta(days=rule[1])
+
+    year, month = after.year, after.month
+    while True:
+        d = _release_in_month(rule, year, month)
+        if d > after:
+            return d
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+
+def previous_release(rule, on):
+    """返回不晚于 on 的最近一个预期发布日；interval 规则没有固定日程，返回 None"""
+    kind = rule[0]
+    if kind == "weekly":
+        return on - timedelta(days=(on.weekday() - rule[1]) % 7)
+    if kind == "interval":
+        return None
+
+    year, month = on.year, on.month
+    while True:
+        d = _release_in_month(rule, year, month)
+        if d <= on:
+            return d
+        year, month = (year - 1, 12) if month == 1 else (year, month - 1)
+
+def _json_default(obj):
+    # numpy 标量 / Timestamp
+    if hasattr(obj, "item"):
+        return obj.item()
+    return str(obj)
+
+def latest_date(records):
+    dates = [str(r.get("日期") or r.get("_std_date") or "") for r in records]
+    dates = [d for d in dates if d and d != "None"]
+    return max(dates) if dates else None
+
+class MacroCache:
+    def __init__(self, cache_file=None, schedule=None, enabled=CACHE_ENABLED):
+        self.cache_file = cache_file or utils.state_path(CACHE_FILENAME)
+        self.schedule = RELEASE_SCHEDULE if schedule is None else schedule
+        self.enabled = enabled
+        self.lock = threading.Lock()
+        self.entries = {}
+        if self.enabled:
+            self._load()
+
+    def _today(self):
+        return datetime.now(TZ_CN).date()
+
+    def _load(self):
+        if not os.path.exists(self.cache_file):
+            return
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                self.entries = json.load(f).get("entries", {})
+        except Exception as e:
+            print(f"⚠️ 宏观缓存读取失败: {e}")
+
+    def save(self):
+        if not self.enabled:
+            return
+        with self.lock:
+            payload = {"updated_at": datetime.now(TZ_CN).strftime("%Y-%m-%d %H:%M:%S"), "entries": self.entries}
+            try:
+                tmp_path = self.cache_file + ".tmp"
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(payload, f, ensure_ascii=False, default=_json_default)
+                os.replace(tmp_path, self.cache_file)
+            except Exception as e:
+                print(f"⚠️ 宏观缓存写入失败: {e}")
+
+    def get_fresh(self, name):
+        """在下一个预期发布日之前返回缓存的记录，否则返回 None (需要重新抓取)"""
+        if not self.enabled or name not in self.schedule:
+            return None
+        with self.lock:
+            entry = self.entries.get(name)
+        if not entry or not entry.get("records"):
+            return None
+        today = self._today()
+        fetched = date.fromisoformat(entry["fetched_at"][:10])
+        if (today - fetched).days > MAX_CACHE_AGE_DAYS:
+            return None
+        if today >= date.fromisoformat(entry["next_release"]):
+            return None
+        return entry["records"]
+
+    def _covers_last_release(self, name, latest, today):
+        """无历史缓存时判断数据是否已包含最近一次预期发布 (最新数据日期不早于该发布日)"""
+        last = previous_release(self.schedule[name], today)
+        if last is None:
+            return True
+        try:
+            return date.fromisoformat(str(latest)[:10]) >= last
+        except (TypeError, ValueError):
+            return False
+
+    def update(self, name, records):
+        """
+        记录一次成功抓取: 出现新一期数据时把下一个发布日向后推；
+        仍是旧数据 (尚未公布) 时保持 next_release 不变，下次运行继续轮询
+        首次抓取 (或缓存被清空) 时无法与上次比较，只有最新数据日期不早于最近一次预期发布日才向后推，
+        否则 next_release 取今天 (如发布日当天公布前抓到的上期数据)，下次运行继续检查
+        """
+        if not self.enabled or name not in self.schedule or not records:
+            return
+        today = self._today()
+        latest = latest_date(records)
+        with self.lock:
+            entry = self.entries.get(name, {})
+            if entry:
+                confirmed = latest != entry.get("latest")
+            else:
+                confirmed = self._covers_last_release(name, latest, today)
+            if confirmed:
+                next_date = next_release(self.schedule[name], today)
+            else:
+                next_date = date.fromisoformat(entry["next_release"]) if entry else today
+            self.entries[name] = {
+                "records": records,
+                "latest": latest,
+                "fetched_at": today.isoformat(),
+                "next_release": next_date.isoformat(),
+            }
+        if not confirmed:
+            print(f"   🕒 [{name}] 尚未公布新数据 (最新 {latest})，下次运行继续轮询")
@@ -550,6 +550,7 @@ import MarketRadar
 import utils
 import scrape_economy_selenium
 import fetch_data_core
+import market_shard
 
 OUTPUT_FILENAME = "MarketRadar_Report.json"
 LOG_FILENAME = "market_data_status.txt"
@@ -680,12 +681,18 @@ def write_status_log(logs, filename):
     except:
         return False
 
-def main():
+def main(kline_shard_dir=None, kline_shard_count=None):
+    """
+    kline_shard_dir: 若指定，则 Step 3 不再抓取 K线，而是合并该目录下的分片结果 (见 market_shard.py)
+    """
     start_time = time.time()
     print_banner()
     
     all_status_logs = []
 
+    # 后台预热 Step 2 的浏览器池，Chrome 启动与 Step 1 的汇率/国债抓取重叠
+    scrape_economy_selenium.prewarm()
+
     # 1. 基础 FX 和 国债
     print("\n[Step 1] 获取汇率与国债...")
     try:
@@ -709,7 +716,10 @@ def main():
     # 3. K线与自定义标的 (MarketRadar - 包含券商/ETF)
     print("\n[Step 3] 获取 K线 & 券商/ETF (MarketRadar)...")
     try:
-        kline_result, logs_klines = MarketRadar.get_all_kline_data()
+        if kline_shard_dir:
+            kline_result, logs_klines = market_shard.merge_shards(kline_shard_dir, kline_shard_count)
+        else:
+            kline_result, logs_klines = MarketRadar.get_all_kline_data()
         all_status_logs.extend(logs_klines)
         
         kline_data_dict = {"meta": kline_result.get("meta"), "data": kline_result.get("data")}
@@ -743,6 +753,9 @@ def main():
     # 5. 整合
     print("\n[Step 5] 整合数据...")
     final_data = merge_final_report(combined_macro, kline_data_dict, ma_data_dict, kcb50_data=kcb50_dict)
+    selenium_metrics = scrape_economy_selenium.get_run_metrics()
+    if selenium_metrics:
+        final_data["meta"]["selenium_pool"] = selenium_metrics
     
     # 🎯 关键修复 1：去重
     final_data = deduplicate_data(final_data)
@@ -9,7 +9,8 @@ import socket
 import numpy as np 
 from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError
 
-import utils
+import concurrency_tuner
+import indicator_pool
 
 # === 尝试导入 MyTT ===
 try:
@@ -32,6 +33,22 @@ ENV_KEYS = {
     "FMP": os.environ.get("FMP_API_Key"),
 }
 
+# AkShare 各类资产实际访问的主机 (用于按主机调节并发)
+AK_HOST_BY_TYPE = {
+    "index_us": "sina.com.cn",
+    "index_hk": "sina.com.cn",
+    "future_foreign": "sina.com.cn",
+    "stock_hk": "sina.com.cn",
+    "stock_us": "sina.com.cn",
+    "future_zh_sina": "sina.com.cn",
+    "stock_vn": "eastmoney.com",
+    "etf_zh": "eastmoney.com",
+    "stock_zh_a": "eastmoney.com",
+    "fund_open": "eastmoney.com",
+}
+YF_HOST = "yahoo.com"
+KLINE_MAX_WORKERS = 16
+
 # ========================================================
 # 技术指标计算辅助函数
 # ========================================================
@@ -104,6 +121,7 @@ class MarketFetcher:
         self.session = requests.Session()
         self.fetch_start_date = fetch_start_date
         self.end_date = end_date
+        self.tuner = concurrency_tuner.get_tuner()
     
     def normalize_df(self, df, name):
         """统一清洗K线数据格式"""
@@ -178,32 +196,38 @@ class MarketFetcher:
                 start_date_clean = self.fetch_start_date.replace("-", "")
                 end_date_clean = self.end_date.replace("-", "")
 
-                if asset_type == "index_us":
-                    df = ak.index_us_stock_sina(symbol=symbol)
-                elif asset_type == "index_hk":
-                    df = ak.stock_hk_index_daily_sina(symbol=symbol)
-                elif asset_type == "future_foreign":
-                    df = ak.futures_foreign_hist(symbol=symbol)
-                elif asset_type == "stock_hk":
-                    df = ak.stock_hk_daily(symbol=symbol, adjust="qfq")
-                elif asset_type == "stock_vn":
+                host = AK_HOST_BY_TYPE.get(asset_type, "eastmoney.com")
+                with self.tuner.slot(host):
+                    start = time.time()
                     try:
-                        df = ak.stock_vn_hist(symbol=symbol)
-                    except:
-                        df = pd.DataFrame()
-                elif asset_type == "stock_us":
-                    df = ak.stock_us_daily(symbol=symbol, adjust="qfq")
-                elif asset_type == "future_zh_sina":
-                    df = ak.futures_main_sina(symbol=symbol)
-                elif asset_type == "etf_zh":
-                    # 场内ETF/LOF
-                    df = ak.fund_etf_hist_em(symbol=symbol, period="daily", start_date=start_date_clean, end_date=end_date_clean, adjust="qfq")
-                elif asset_type == "stock_zh_a":
-                    df = ak.stock_zh_a_hist(symbol=symbol, period="daily", start_date=start_date_clean, end_date=end_date_clean, adjust="qfq")
-                elif asset_type == "fund_open":
-                    # 【新增】场外基金/LOF净值
-                    # 注意：fund_open_fund_info_em 返回的是全量历史，不需要start/end
-                    df = ak.fund_open_fund_info_em(fund=symbol, indicator="单位净值走势")
+                        if asset_type == "index_us":
+                            df = ak.index_us_stock_sina(symbol=symbol)
+                        elif asset_type == "index_hk":
+                            df = ak.stock_hk_index_daily_sina(symbol=symbol)
+                        elif asset_type == "future_foreign":
+                            df = ak.futures_foreign_hist(symbol=symbol)
+                        elif asset_type == "stock_hk":
+                            df = ak.stock_hk_daily(symbol=symbol, adjust="qfq")
+                        elif asset_type == "stock_vn":
+                            df = ak.stock_vn_hist(symbol=symbol)
+                        elif asset_type == "stock_us":
+                            df = ak.stock_us_daily(symbol=symbol, adjust="qfq")
+                        elif asset_type == "future_zh_sina":
+                            df = ak.futures_main_sina(symbol=symbol)
+                        elif asset_type == "etf_zh":
+                            # 场内ETF/LOF
+                            df = ak.fund_etf_hist_em(symbol=symbol, period="daily", start_date=start_date_clean, end_date=end_date_clean, adjust="qfq")
+                        elif asset_type == "stock_zh_a":
+                            df = ak.stock_zh_a_hist(symbol=symbol, period="daily", start_date=start_date_clean, end_date=end_date_clean, adjust="qfq")
+                        elif asset_type == "fund_open":
+                            # 【新增】场外基金/LOF净值
+                            # 注意：fund_open_fund_info_em 返回的是全量历史，不需要start/end
+                            df = ak.fund_open_fund_info_em(fund=symbol, indicator="单位净值走势")
+                    except Exception as e:
+                        self.tuner.record(host, time.time() - start, ok=False, throttled=concurrency_tuner.is_throttle_error(e))
+                        raise
+                    # 东方财富/新浪被限流时常静默返回空表，与 yfinance 一样计为失败
+                    self.tuner.record(host, time.time() - start, ok=not df.empty)
                 
                 if not df.empty:
                     print(" ✅")
@@ -224,7 +248,15 @@ class MarketFetcher:
         # 略微简化打印
         print(f"   ⚡ [YFinance] {symbol} ...", end="", flush=True)
         try:
-            df = yf.download(symbol, start=self.fetch_start_date, end=self.end_date, progress=False, auto_adjust=False)
+            with self.tuner.slot(YF_HOST):
+                start = time.time()
+                try:
+                    df = yf.download(symbol, start=self.fetch_start_date, end=self.end_date, progress=False, auto_adjust=False)
+                except Exception as e:
+                    self.tuner.record(YF_HOST, time.time() - start, ok=False, throttled=concurrency_tuner.is_throttle_error(e))
+                    raise
+                # yfinance 被限流时通常静默返回空表，计为失败
+                self.tuner.record(YF_HOST, time.time() - start, ok=not df.empty)
             if not df.empty:
                 df = df.reset_index()
                 if isinstance(df.columns, pd.MultiIndex):
@@ -267,15 +299,6 @@ def fetch_group_data(fetcher, targets, group_name, report_start_date, end_date):
             
             df = df.sort_values(by='date', ascending=True)
             
-            # 计算均线
-            ma_info_list = utils.calculate_ma(df) 
-            ma_info = ma_info_list[0] if ma_info_list else None
-            
-            # 计算指标
-            tech_indicators = calculate_tech_indicators(df)
-            if ma_info:
-                ma_info.update(tech_indicators)
-
             # 切片用于前端/JSON展示
             df_slice = df[(df['date'] >= pd.to_datetime(report_start_date)) & (df['date'] <= pd.to_datetime(end_date))].copy()
             if not df_slice.empty:
@@ -284,24 +307,53 @@ def fetch_group_data(fetcher, targets, group_name, report_start_date, end_date):
             else:
                 kline_records = []
             
-            return kline_records, ma_info, {'name': name, 'status': True, 'error': None}
+            return kline_records, df, {'name': name, 'status': True, 'error': None}
 
         except Exception as e:
             return None, None, {'name': name, 'status': False, 'error': str(e)}
 
-    with ThreadPoolExecutor(max_workers=5) as executor:
+    # 线程池按各主机的并发上限确定，实际并发由 tuner 按主机动态控制
+    hosts = []
+    for config in targets.values():
+        if config.get("ak"):
+            hosts.append(AK_HOST_BY_TYPE.get(config.get("type"), "eastmoney.com"))
+        if config.get("yf"):
+            hosts.append(YF_HOST)
+    max_workers = fetcher.tuner.max_workers(hosts, cap=KLINE_MAX_WORKERS)
+
+    # 网络抓取完成一个即提交一个指标计算，两个阶段流水线并行
+    indicator_jobs = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
         future_to_name = {executor.submit(fetch_task, name, config): name for name, config in targets.items()}
         for future in as_completed(future_to_name):
             name = future_to_name[future]
             try:
                 result = future.result(timeout=45) 
-                klines, ma, status = result
+                klines, df, status = result
                 status_logs.append(status)
                 if klines: kline_list.extend(klines)
-                if ma: ma_list.append(ma)
+                # 均线/技术指标属于 CPU 密集计算，交给 indicator_pool 的独立进程处理
+                if df is not None:
+                    indicator_jobs[name] = (indicator_pool.submit(name, df), df)
             except Exception as e:
                 status_logs.append({'name': name, 'status': False, 'error': str(e)})
 
+    # 按标的配置顺序收集 (而非完成顺序)，使单进程与分片合并后的 ma_data 顺序一致
+    for name in [n for n in targets if n in indicator_jobs]:
+        job, df = indicator_jobs[name]
+        try:
+            ma = job.result()
+        except Exception as e:
+            # 进程池异常 (如 worker 崩溃) 时回退到本地计算
+            print(f"   ⚠️ [{name}] 指标进程计算失败，改为本地计算: {e}")
+            try:
+                ma = indicator_pool.compute_summary(name, df)
+            except Exception:
+                ma = None
+        if ma: ma_list.append(ma)
+
+    fetcher.tuner.save()
+
     # 按最新日期倒序整理
     if kline_list:
         temp_df = pd.DataFrame(kline_list)
@@ -0,0 +1,221 @@
+#!/usr/bin/env python
+# -*- coding:utf-8 -*-
+"""
+K线任务分片 (Sharding)
+功能：将 MarketRadar.KLINE_GROUPS 中的全部标的确定性地拆分到 N 个 worker，
+每个 worker 写出一个分片结果文件，最后由 merge 命令汇总并生成与单进程完全一致的报告。
+
+用法:
+    python market_shard.py run --index 0 --count 4 [--strategy hash|cost]
+    python market_shard.py merge [--dir shards] [--count 4]
+"""
+
+import os
+import sys
+import json
+import glob
+import zlib
+import argparse
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+TZ_CN = ZoneInfo("Asia/Shanghai")
+SHARD_DIR = "shards"
+SHARD_FILE_PATTERN = "kline_shard_{index}_of_{count}.json"
+
+# 各类资产的预估抓取耗时 (相对值)，用于 cost 策略的负载均衡
+# 场外基金/港美股接口返回全量历史，明显慢于 ETF/A股 的区间查询
+TYPE_COST = {
+    "fund_open": 3.0,
+    "stock_hk": 2.5,
+    "stock_us": 2.5,
+    "stock_vn": 2.0,
+    "index_us": 1.5,
+    "index_hk": 1.5,
+    "future_foreign": 1.5,
+    "future_zh_sina": 1.5,
+    "etf_zh": 1.0,
+    "stock_zh_a": 1.0,
+}
+DEFAULT_COST = 1.5
+
+def _shard_key(group_name, name):
+    return f"{group_name}/{name}"
+
+def estimate_cost(config):
+    """预估单个标的的抓取耗时 (仅有 yfinance 源时需要额外的失败回退开销)"""
+    cost = TYPE_COST.get(config.get("type"), DEFAULT_COST)
+    if not config.get("ak"):
+        cost += 1.0
+    return cost
+
+def assign_shards(groups, shard_count, strategy="hash"):
+    """
+    计算每个标的所属分片
+    返回: {(group_name, name): shard_index}
+    - hash: crc32(组名/名称) % N，与进程、机器无关，新增标的不影响已有标的的分配
+    - cost: 按预估耗时从大到小贪心分配到当前负载最小的分片 (LPT)
+    """
+    if shard_count < 1:
+        raise ValueError(f"shard_count 必须 >= 1: {shard_count}")
+
+    items = [(group_name, name, config) for targets, group_name, _ in groups for name, config in targets.items()]
+    assignment = {}
+
+    if strategy == "hash":
+        for group_name, name, _ in items:
+            key = _shard_key(group_name, name).encode("utf-8")
+            assignment[(group_name, name)] = zlib.crc32(key) % shard_count
+    elif strategy == "cost":
+        loads = [0.0] * shard_count
+        ordered = sorted(items, key=lambda x: (-estimate_cost(x[2]), _shard_key(x[0], x[1])))
+        for group_name, name, config in ordered:
+            idx = min(range(shard_count), key=lambda i: (loads[i], i))
+            loads[idx] += estimate_cost(config)
+            assignment[(group_name, name)] = idx
+    else:
+        raise ValueError(f"未知分片策略: {strategy}")
+
+    return assignment
+
+def select_shard(groups, shard_index, shard_count, strategy="hash"):
+    """返回与 groups 结构相同、但仅包含第 shard_index 片标的的任务组列表"""
+    if not 0 <= shard_index < shard_count:
+        raise ValueError(f"shard_index 超出范围: {shard_index} (共 {shard_count} 片)")
+
+    assignment = assign_shards(groups, shard_count, strategy)
+    selected = []
+    for targets, group_name, ma_type in groups:
+        subset = {name: config for name, config in targets.items() if assignment[(group_name, name)] == shard_index}
+        selected.append((subset, group_name, ma_type))
+    return selected
+
+def shard_path(shard_index, shard_count, shard_dir=SHARD_DIR):
+    return os.path.join(shard_dir, SHARD_FILE_PATTERN.format(index=shard_index, count=shard_count))
+
+def _json_default(obj):
+    # numpy 标量 / 数组
+    if hasattr(obj, "tolist"):
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def run_shard(shard_index, shard_count, strategy="hash", shard_dir=SHARD_DIR):
+    """抓取单个分片并写出分片结果文件"""
+    import MarketRadar
+
+    kline_result, status_logs = MarketRadar.get_all_kline_data(shard_index, shard_count, strategy)
+
+    os.makedirs(shard_dir, exist_ok=True)
+    path = shard_path(shard_index, shard_count, shard_dir)
+    payload = {
+        "shard_index": shard_index,
+        "shard_count": shard_count,
+        "strategy": strategy,
+        "generated_at": datetime.now(TZ_CN).strftime("%Y-%m-%d %H:%M:%S"),
+        "data": kline_result.get("data", {}),
+        "ma_data": kline_result.get("ma_data", {}),
+        "status_logs": status_logs,
+    }
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(payload, f, ensure_ascii=False, default=_json_default)
+    os.replace(tmp_path, path)
+    print(f"✅ 分片结果已写入 {path}")
+    return path
+
+def merge_shards(shard_dir=SHARD_DIR, shard_count=None):
+    """
+    汇总分片结果，返回与 MarketRadar.get_all_kline_data() 相同结构的 (kline_result, status_logs)
+    缺失的分片会以 [FAIL] 形式记录在状态日志中
+    """
+    import MarketRadar
+
+    shards = {}
+    for path in sorted(glob.glob(os.path.join(shard_dir, "kline_shard_*_of_*.json"))):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                payload = json.load(f)
+        except Exception as e:
+            print(f"⚠️ 分片文件读取失败 {path}: {e}")
+            continue
+        count = payload.get("shard_count")
+        if shard_count is None:
+            shard_count = count
+        if count != shard_count:
+            print(f"⚠️ 跳过分片数不一致的文件 {path} ({count} != {shard_count})")
+            continue
+        shards[payload.get("shard_index")] = payload
+
+    if not shard_count:
+        raise FileNotFoundError(f"未在 {shard_dir} 找到任何分片结果")
+
+    print(f"🧩 合并分片: {len(shards)}/{shard_count}")
+
+    kline_result = {
+        "meta": {
+            "generated_at": datetime.now(TZ_CN).strftime("%Y-%m-%d %H:%M:%S"),
+        },
+        "data": {},
+        "ma_data": {
+            "general": [],
+            "commodities": []
+        }
+    }
+    status_logs = []
+
+    for idx in range(shard_count):
+        if idx not in shards:
+            status_logs.append({'name': f"K线分片_{idx}", 'status': False, 'error': "Shard result missing"})
+
+    # 按 KLINE_GROUPS 的顺序组装，保证与单进程报告的分组顺序一致
+    for _, group_name, _ in MarketRadar.KLINE_GROUPS:
+        kline_list = []
+        for idx in sorted(shards):
+            shard = shards[idx]
+            kline_list.extend(shard.get("data", {}).get(group_name, []))
+
+        # 与 fetch_group_data 一致: 按日期倒序、名称正序
+        kline_list.sort(key=lambda x: x.get("name", ""))
+        kline_list.sort(key=lambda x: x.get("date", ""), reverse=True)
+        kline_result["data"][group_name] = kline_list
+
+    for idx in sorted(shards):
+        shard = shards[idx]
+        for ma_type, items in shard.get("ma_data", {}).items():
+            kline_result["ma_data"].setdefault(ma_type, []).extend(items)
+        status_logs.extend(shard.get("status_logs", []))
+
+    # ma_data 同样按 KLINE_GROUPS 的分组与标的顺序排列，与单进程报告一致
+    target_order = {}
+    for targets, _, _ in MarketRadar.KLINE_GROUPS:
+        for name in targets:
+            target_order.setdefault(name, len(target_order))
+    for items in kline_result["ma_data"].values():
+        items.sort(key=lambda x: target_order.get(x.get("名称"), len(target_order)))
+
+    return kline_result, status_logs
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="MarketRadar K线分片执行与合并")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_run = sub.add_parser("run", help="抓取单个分片")
+    p_run.add_argument("--index", type=int, required=True, help="分片序号 (从 0 开始)")
+    p_run.add_argument("--count", type=int, required=True, help="分片总数")
+    p_run.add_argument("--strategy", choices=["hash", "cost"], default="hash")
+    p_run.add_argument("--dir", default=SHARD_DIR, help="分片结果目录")
+
+    p_merge = sub.add_parser("merge", help="合并分片并生成最终报告")
+    p_merge.add_argument("--dir", default=SHARD_DIR, help="分片结果目录")
+    p_merge.add_argument("--count", type=int, default=None, help="期望的分片总数 (默认取分片文件中的值)")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        run_shard(args.index, args.count, args.strategy, args.dir)
+    else:
+        import main as radar_main
+        radar_main.main(kline_shard_dir=args.dir, kline_shard_count=args.count)
+
+if __name__ == "__main__":
+    sys.exit(main())
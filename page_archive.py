@@ -0,0 +1,185 @@
+#!/usr/bin/env python
+# -*- coding:utf-8 -*-
+"""
+原始页面数据归档 (Raw Page Archive)
+功能：每个数据源取回的原始数据 (表格单元格文本 / HTML / 接口 JSON) 连同解析函数与参数，
+gzip 压缩后按内容哈希存储 (内容未变化的页面跨运行只存一份)，每次运行生成一份清单 (数据源 -> 对象哈希)。
+解析逻辑修改后，可用当前代码重放归档，无需重新抓取:
+
+    python page_archive.py list
+    python page_archive.py reparse [run_id] [--source 名称] [--output OnlineReport.json]
+
+注意: days_to_keep 截止日期、CNN 抓取日期等与当前时间相关的逻辑按重放时的日期计算。
+"""
+
+import os
+import sys
+import gzip
+import json
+import hashlib
+import argparse
+import importlib
+import threading
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+import utils
+
+TZ_CN = ZoneInfo("Asia/Shanghai")
+
+# MARKETRADAR_PAGE_ARCHIVE=0 关闭归档
+ARCHIVE_ENABLED = os.environ.get("MARKETRADAR_PAGE_ARCHIVE", "1") != "0"
+ARCHIVE_ROOT = os.environ.get("MARKETRADAR_PAGE_ARCHIVE_DIR") or os.path.join(utils.STATE_DIR, "page_archive")
+KEEP_RUNS = int(os.environ.get("MARKETRADAR_PAGE_ARCHIVE_KEEP", "30"))
+
+RUN_ID = datetime.now(TZ_CN).strftime("%Y%m%d_%H%M%S")
+
+_LOCK = threading.Lock()
+_MANIFEST = {}
+
+def _objects_dir():
+    return os.path.join(ARCHIVE_ROOT, "objects")
+
+def _runs_dir():
+    return os.path.join(ARCHIVE_ROOT, "runs")
+
+def _object_path(digest):
+    return os.path.join(_objects_dir(), digest[:2], digest[2:] + ".json.gz")
+
+def _json_default(obj):
+    # numpy 标量 / Timestamp
+    if hasattr(obj, "item"):
+        return obj.item()
+    return str(obj)
+
+def _write_atomic(path, data, mode='wb'):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{threading.get_ident()}.tmp"
+    with open(tmp_path, mode) as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+def record(source, func, args):
+    """
+    归档一次取回的原始数据: func 为模块级解析函数 (返回记录列表)，args 为其参数 (需可 JSON 序列化)
+    同一数据源多次尝试时，清单中保留最后一次
+    """
+    if not ARCHIVE_ENABLED:
+        return None
+    try:
+        parser = f"{func.__module__}.{func.__name__}"
+        data = json.dumps({"parser": parser, "args": list(args)}, ensure_ascii=False, sort_keys=True,
+                          default=_json_default).encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        path = _object_path(digest)
+        if not os.path.exists(path):
+            _write_atomic(path, gzip.compress(data))
+
+        with _LOCK:
+            _MANIFEST[source] = {
+                "object": digest, "parser": parser, "size": len(data),
+                "fetched_at": datetime.now(TZ_CN).strftime("%Y-%m-%d %H:%M:%S"),
+            }
+            manifest = json.dumps({"run_id": RUN_ID, "sources": _MANIFEST}, ensure_ascii=False, indent=2)
+            _write_atomic(os.path.join(_runs_dir(), f"{RUN_ID}.json"), manifest, mode='w')
+        return digest
+    except Exception as e:
+        print(f"⚠️ [Archive] [{source}] 归档失败: {str(e)[:100]}")
+        return None
+
+def list_runs():
+    if not os.path.isdir(_runs_dir()):
+        return []
+    return sorted(f[:-5] for f in os.listdir(_runs_dir()) if f.endswith(".json"))
+
+def load_manifest(run_id=None):
+    runs = list_runs()
+    if not runs:
+        raise FileNotFoundError(f"归档目录为空: {ARCHIVE_ROOT}")
+    run_id = run_id or runs[-1]
+    with open(os.path.join(_runs_dir(), f"{run_id}.json"), 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def load_object(digest):
+    with gzip.open(_object_path(digest), 'rt', encoding='utf-8') as f:
+        return json.load(f)
+
+def reparse_entry(entry):
+    """用当前代码中的解析函数重放一条归档，返回记录列表 (解析失败时抛出异常)"""
+    obj = load_object(entry["object"])
+    module_name, func_name = obj["parser"].rsplit(".", 1)
+    func = getattr(importlib.import_module(module_name), func_name)
+    return func(*obj["args"])
+
+def reparse(run_id=None, sources=None):
+    """重放一次运行的全部 (或指定) 数据源，返回 (results, status_logs)"""
+    manifest = load_manifest(run_id)
+    print(f"♻️ [Archive] 重放运行 {manifest['run_id']} ({len(manifest['sources'])} 个数据源)")
+    results, status_logs = {}, []
+    for name, entry in manifest["sources"].items():
+        if sources and name not in sources:
+            continue
+        try:
+            records = reparse_entry(entry)
+            results[name] = records
+            status_logs.append({'name': name, 'status': True, 'error': None})
+            print(f"✅ [{name}] 解析成功: {len(records)} 条记录")
+        except Exception as e:
+            results[name] = []
+            status_logs.append({'name': name, 'status': False, 'error': str(e)})
+            print(f"❌ [{name}] 解析失败: {str(e)[:200]}")
+    return results, status_logs
+
+def prune(keep=KEEP_RUNS):
+    """只保留最近 keep 次运行的清单，并删除不再被引用的对象"""
+    keep = max(1, keep)
+    runs = list_runs()
+    if len(runs) <= keep:
+        return
+    for run_id in runs[:-keep]:
+        os.remove(os.path.join(_runs_dir(), f"{run_id}.json"))
+
+    referenced = set()
+    for run_id in runs[-keep:]:
+        try:
+            referenced.update(e["object"] for e in load_manifest(run_id)["sources"].values())
+        except Exception:
+            # 清单损坏时不删除任何对象
+            return
+    removed = 0
+    for root, _, files in os.walk(_objects_dir()):
+        for f in files:
+            digest = os.path.basename(root) + f.replace(".json.gz", "")
+            if f.endswith(".json.gz") and digest not in referenced:
+                os.remove(os.path.join(root, f))
+                removed += 1
+    print(f"🧹 [Archive] 已清理 {len(runs) - keep} 份旧清单、{removed} 个对象")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="原始页面数据归档: 列出运行 / 以当前解析逻辑重放")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("list", help="列出已归档的运行")
+    p_reparse = sub.add_parser("reparse", help="以当前解析函数重放归档")
+    p_reparse.add_argument("run_id", nargs="?", help="运行 ID (默认最近一次)")
+    p_reparse.add_argument("--source", action="append", help="只重放指定数据源 (可多次指定)")
+    p_reparse.add_argument("--output", help="将重建的宏观数据 (与 OnlineReport.json 相同结构) 写入该文件")
+    args = parser.parse_args(argv)
+
+    if args.command == "list":
+        for run_id in list_runs():
+            manifest = load_manifest(run_id)
+            print(f"{run_id}  {len(manifest['sources'])} 个数据源")
+        return 0
+
+    results, status_logs = reparse(args.run_id, args.source)
+    if args.output:
+        import selenium_core
+        scraper = selenium_core.MacroDataScraper()
+        scraper.results = results
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(scraper.organize_data(), f, ensure_ascii=False, indent=4, default=_json_default)
+        print(f"💾 重建数据已写入: {args.output}")
+    return 0 if all(log['status'] for log in status_logs) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,9 +7,32 @@
 import selenium_core
 import json
 
+# prewarm() 创建的实例，供随后的 get_macro_data() 直接使用
+_PREWARMED_SCRAPER = None
+# 最近一次 get_macro_data() 的浏览器池运行指标 (写入报告 meta)
+_LAST_RUN_METRICS = {}
+
+def prewarm():
+    """在后台启动浏览器池，使 Chrome 启动与其他步骤并行"""
+    global _PREWARMED_SCRAPER
+    try:
+        _PREWARMED_SCRAPER = selenium_core.MacroDataScraper()
+        _PREWARMED_SCRAPER.prewarm()
+    except Exception as e:
+        print(f"⚠️ 浏览器预热失败: {e}")
+        _PREWARMED_SCRAPER = None
+
 def get_macro_data():
-    scraper = selenium_core.MacroDataScraper()
-    return scraper.get_data_dict()
+    global _PREWARMED_SCRAPER, _LAST_RUN_METRICS
+    scraper = _PREWARMED_SCRAPER or selenium_core.MacroDataScraper()
+    _PREWARMED_SCRAPER = None
+    try:
+        return scraper.get_data_dict()
+    finally:
+        _LAST_RUN_METRICS = scraper.run_metrics
+
+def get_run_metrics():
+    return dict(_LAST_RUN_METRICS)
 
 if __name__ == "__main__":
     scraper = selenium_core.MacroDataScraper()
@@ -0,0 +1,67 @@
+# selenium_capture.py
+# -----------------------------------------------------------------------------
+# DeepSeek Finance Project - CDP Network Capture
+# 通过 Chrome performance 日志监听页面自身发出的 XHR/fetch 请求，
+# 在 JSON 响应返回后立即取回响应体，无需等待页面渲染完成再解析 DOM
+# -----------------------------------------------------------------------------
+
+import re
+import json
+import time
+import base64
+
+POLL_INTERVAL = 0.25
+
+def enable_capture(chrome_options):
+    """开启 performance 日志 (仅记录 Network 事件)，对由该 options 创建的所有 driver 生效"""
+    chrome_options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+    chrome_options.add_experimental_option("perfLoggingPrefs", {"enableNetwork": True, "enablePage": False})
+
+def drain(driver):
+    """丢弃已缓冲的网络事件 (driver 复用前调用，避免读到上一个页面的响应)"""
+    try:
+        driver.get_log("performance")
+    except Exception:
+        pass
+
+def _read_body(driver, request_id):
+    body = driver.execute_cdp_cmd("Network.getResponseBody", {"requestId": request_id})
+    text = body.get("body", "")
+    if body.get("base64Encoded"):
+        text = base64.b64decode(text).decode("utf-8", errors="replace")
+    return json.loads(text)
+
+def wait_for_json(driver, url_pattern, timeout=20, validate=None):
+    """
+    等待 URL 匹配 url_pattern 的响应加载完成并解析为 JSON
+    validate: 可选回调，返回 False 时忽略该响应继续等待 (如同一接口的其他参数请求)
+    返回: (url, data)；超时返回 (None, None)
+    """
+    pattern = re.compile(url_pattern)
+    pending = {}
+    deadline = time.time() + timeout
+
+    while time.time() < deadline:
+        for entry in driver.get_log("performance"):
+            try:
+                message = json.loads(entry["message"])["message"]
+            except (KeyError, ValueError):
+                continue
+            method = message.get("method")
+            params = message.get("params", {})
+
+            if method == "Network.responseReceived":
+                url = params.get("response", {}).get("url", "")
+                if pattern.search(url):
+                    pending[params.get("requestId")] = url
+            elif method == "Network.loadingFinished" and params.get("requestId") in pending:
+                url = pending.pop(params["requestId"])
+                try:
+                    data = _read_body(driver, params["requestId"])
+                except Exception:
+                    continue
+                if validate is None or validate(data):
+                    return url, data
+        time.sleep(POLL_INTERVAL)
+
+    return None, None
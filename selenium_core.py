@@ -3,10 +3,238 @@
 # DeepSeek Finance Project - Selenium Scraper Core Logic
 # -----------------------------------------------------------------------------
 
+import os
+import time
+import signal
+import threading
+from contextlib import contextmanager
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from selenium.webdriver.chrome.options import Options
-import selenium_scrapers_investing
-import selenium_scrapers_misc
+import selenium_registry
+import concurrency_tuner
+import selenium_pool
+import selenium_capture
+import selenium_parse
+import selenium_resources
+import macro_cache
+import page_archive
+
+# 同时运行的 Chrome 实例上限在创建 MacroDataScraper 时按可用内存与 CPU 核数估算 (selenium_resources)，
+# 各主机的并发由 tuner 在此范围内调节
+# 多标签页模式 (MARKETRADAR_TABS_PER_BROWSER>1) 下并发上限为 浏览器数 × 每个浏览器的标签页数
+
+# 单个页面 (一次借出到归还) 的硬性墙钟上限 = 注册表中的页面加载超时 + 宽限时间，超出后强制结束浏览器进程
+PAGE_GRACE_SECONDS = 60
+WATCHDOG_INTERVAL = 2
+QUIT_GRACE_SECONDS = 2      # driver.quit() 后等待进程自行退出的时间
+
+def _process_table():
+    """Linux 下读取 /proc 得到 {pid: (ppid, state)}；其他平台返回空表 (只处理已知 PID)"""
+    table = {}
+    if not os.path.isdir("/proc"):
+        return table
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat", "r") as f:
+                # 进程名可能包含空格和括号，从最后一个 ')' 之后解析
+                fields = f.read().rsplit(")", 1)[1].split()
+            table[int(entry)] = (int(fields[1]), fields[0])
+        except (OSError, IndexError, ValueError):
+            continue
+    return table
+
+def _descendants(pids, table):
+    result, queue = [], list(pids)
+    while queue:
+        pid = queue.pop()
+        children = [p for p, (ppid, _) in table.items() if ppid == pid]
+        result.extend(children)
+        queue.extend(children)
+    return result
+
+def _alive(pid, table):
+    if table:
+        # 僵尸进程已不占内存，视为已退出
+        return pid in table and table[pid][1] != "Z"
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    except OSError:
+        return False
+    return True
+
+def _kill(pid):
+    try:
+        os.kill(pid, getattr(signal, "SIGKILL", signal.SIGTERM))
+        return True
+    except OSError:
+        return False
+
+class BrowserWatchdog:
+    """
+    跟踪浏览器池启动的 chromedriver / Chrome 进程:
+    页面超过硬性时限时强制结束所在浏览器 (使阻塞在 driver.get 的线程立即失败并进入重试)；
+    driver.quit() 失败或超时后仍残留的进程同样强制结束，结果汇总到状态日志；
+    同时定期采样浏览器数量与进程树内存，记录峰值供运行指标与下次池大小估算使用
+    多标签页模式下强制结束会影响同一浏览器上的其他标签页 (它们会随之失败并重试)
+    """
+    def __init__(self, grace=PAGE_GRACE_SECONDS, interval=WATCHDOG_INTERVAL):
+        self.grace = grace
+        self.interval = interval
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.browsers = {}      # id(driver) -> chromedriver 及其进程树中全部 PID (定期刷新)
+        self.pages = {}         # id(handle) -> {"name", "driver", "deadline", "limit"}
+        self.events = []        # {"name", "pids", "reason"}
+        self.usage = {"browsers": 0, "memory_mb": 0.0, "peak_browsers": 0, "peak_memory_mb": 0.0,
+                      "per_browser_mb": 0.0, "samples": 0}
+        self.stopped = threading.Event()
+        self.thread = None
+
+    @contextmanager
+    def task(self, name, page_timeout):
+        """标记当前线程正在抓取的数据源，其借出的页面按 page_timeout + grace 计时"""
+        self.local.name = name
+        self.local.limit = page_timeout + self.grace
+        try:
+            yield
+        finally:
+            self.local.name = None
+
+    def _tree(self, pids, table):
+        """pids 及其全部子孙进程中仍存活的部分 (去重，保持顺序)"""
+        return [pid for pid in dict.fromkeys(pids + _descendants(pids, table)) if _alive(pid, table)]
+
+    def register(self, driver):
+        """
+        记录 chromedriver 的整棵进程树 (Chrome 主进程及其子进程)
+        chromedriver 退出后 Chrome 会被 init 收养，无法再从 chromedriver 追溯，因此在此时快照并在 _loop 中持续刷新
+        """
+        try:
+            root = driver.service.process.pid
+        except AttributeError:
+            print("⚠️ [Watchdog] 无法获取 chromedriver PID，该浏览器不受监控")
+            return
+        table = _process_table()
+        pids = self._tree([root], table) if table else [root]
+        with self.lock:
+            self.browsers[id(driver)] = pids
+            if self.thread is None or not self.thread.is_alive():
+                self.stopped.clear()
+                self.thread = threading.Thread(target=self._loop, daemon=True)
+                self.thread.start()
+
+    def page_started(self, handle, driver):
+        name = getattr(self.local, "name", None) or "unknown"
+        limit = getattr(self.local, "limit", None) or self.grace * 2
+        with self.lock:
+            self.pages[id(handle)] = {"name": name, "driver": driver, "deadline": time.time() + limit, "limit": limit}
+
+    def page_finished(self, handle):
+        with self.lock:
+            self.pages.pop(id(handle), None)
+
+    def _terminate(self, driver_key, name, reason):
+        with self.lock:
+            pids = self.browsers.pop(driver_key, [])
+        if not pids:
+            return
+        table = _process_table()
+        targets = list(dict.fromkeys(pids + _descendants(pids, table)))
+        killed = [pid for pid in targets if _alive(pid, table) and _kill(pid)]
+        if killed:
+            print(f"🔪 [Watchdog] [{name}] {reason}，已强制结束进程 {killed}")
+            with self.lock:
+                self.events.append({"name": name, "pids": killed, "reason": reason})
+
+    def reap(self, driver):
+        """driver.quit() 之后调用: 短暂等待进程自行退出，仍残留的强制结束"""
+        with self.lock:
+            pids = self.browsers.get(id(driver))
+        if not pids:
+            with self.lock:
+                self.browsers.pop(id(driver), None)
+            return
+        deadline = time.time() + QUIT_GRACE_SECONDS
+        while time.time() < deadline:
+            table = _process_table()
+            if not any(_alive(pid, table) for pid in pids):
+                with self.lock:
+                    self.browsers.pop(id(driver), None)
+                return
+            time.sleep(0.1)
+        self._terminate(id(driver), "driver.quit", "quit 后进程仍未退出")
+
+    def refresh(self, table=None):
+        """
+        重新快照各浏览器的进程树: 追加新启动的子进程 (渲染/GPU 等)，去掉已退出的 PID (避免 PID 复用后误杀)
+        进程已全部退出的浏览器不再跟踪
+        """
+        table = _process_table() if table is None else table
+        if not table:
+            return
+        with self.lock:
+            items = list(self.browsers.items())
+        updated = {key: self._tree(pids, table) for key, pids in items}
+        with self.lock:
+            for key, pids in updated.items():
+                if key not in self.browsers:
+                    continue
+                if pids:
+                    self.browsers[key] = pids
+                else:
+                    self.browsers.pop(key)
+
+    def sample(self, table=None):
+        """采样当前浏览器数量与内存 (每个浏览器含 chromedriver 及全部子进程)；非 Linux 平台只统计数量"""
+        table = _process_table() if table is None else table
+        with self.lock:
+            groups = list(self.browsers.values())
+        memory = 0.0
+        if table:
+            for pids in groups:
+                memory += selenium_resources.process_memory_mb(self._tree(pids, table))
+        with self.lock:
+            u = self.usage
+            u["browsers"], u["memory_mb"] = len(groups), round(memory, 1)
+            u["peak_browsers"] = max(u["peak_browsers"], len(groups))
+            u["peak_memory_mb"] = max(u["peak_memory_mb"], u["memory_mb"])
+            if groups and memory:
+                u["per_browser_mb"] = max(u["per_browser_mb"], round(memory / len(groups), 1))
+            u["samples"] += 1
+
+    def _loop(self):
+        while not self.stopped.wait(self.interval):
+            table = _process_table()
+            self.refresh(table)
+            self.sample(table)
+            now = time.time()
+            with self.lock:
+                expired = [(key, page) for key, page in self.pages.items() if now > page["deadline"]]
+                for key, _ in expired:
+                    self.pages.pop(key, None)
+            for _, page in expired:
+                self._terminate(id(page["driver"]), page["name"], f"页面超过硬性时限 {page['limit']}s")
+
+    def sweep(self):
+        """抓取结束时调用: 结束仍未退出的所有浏览器进程并停止监控线程"""
+        self.stopped.set()
+        with self.lock:
+            keys = list(self.browsers)
+        for key in keys:
+            self._terminate(key, "sweep", "抓取结束时浏览器仍未退出")
+
+    def status_log(self):
+        """有进程被强制结束时返回一条状态日志 (status=True 表示不影响数据结果，仅作提示)"""
+        if not self.events:
+            return None
+        detail = "; ".join(f"{e['name']}: {e['reason']} (PID {e['pids']})" for e in self.events)
+        return {'name': 'Selenium_Watchdog', 'status': True, 'error': f"强制结束 {len(self.events)} 个浏览器: {detail}"}
 
 class MacroDataScraper:
     def __init__(self):
@@ -73,68 +301,171 @@ class MacroDataScraper:
         self.chrome_options.page_load_strategy = 'eager'
         prefs = {"profile.managed_default_content_settings.images": 2}
         self.chrome_options.add_experimental_option("prefs", prefs)
+        # 捕获页面自身的 XHR/JSON 响应 (CNN / CBOE / Investing 优先解析结构化数据)
+        selenium_capture.enable_capture(self.chrome_options)
         
         self.output_path = "OnlineReport.json"
+        self.tuner = concurrency_tuner.get_tuner()
+        self.watchdog = BrowserWatchdog()
+        self.cache = macro_cache.MacroCache(schedule={
+            name: rule for name, rule in macro_cache.RELEASE_SCHEDULE.items()
+            if selenium_registry.get_source(name)["cache"]
+        })
+        # 各 scraper 共享的长生命周期 Chrome 池 (在 run_concurrent 结束时关闭)
+        pool_size, self.sizing = selenium_resources.recommend_browsers()
+        print(f"🧮 [Scraper] 浏览器池大小: {pool_size} ({self.sizing})")
+        self.driver_pool = selenium_pool.create_pool(self.chrome_options, size=pool_size, watchdog=self.watchdog)
+        self.run_metrics = {}
+        # prewarm() 在后台完成缓存与直连阶段，结果 (仍需浏览器的 {name: url}) 供 run_concurrent 使用
+        self.resolver = None
+        self.browser_jobs = None
 
-    def fetch_single_source(self, name, url):
+    def prewarm(self):
         """
-        调度器：根据 name 分发到具体的 scraper 函数
+        后台先完成缓存与接口/HTTP 直连阶段，再按仍需浏览器的数据源 (调度顺序) 预热浏览器池；
+        全部命中缓存或直连成功时不启动任何浏览器
         """
-        # 1. Investing.com 常规历史数据
-        if name == "恒生医疗保健指数":
-            return selenium_scrapers_investing.fetch_investing_source(name, url, self.chrome_options)
-        
-        # Investing.com 近 10 天数据组
-        if name in ["BDI_波罗的海指数", "CBOE_SKEW"]:
-            return selenium_scrapers_investing.fetch_investing_source(name, url, self.chrome_options, days_to_keep=10)
+        selenium_parse.start()
 
-        # 2. Investing.com 财经日历数据
-        if name == "USA_Initial_Jobless":
-            return selenium_scrapers_investing.fetch_investing_economic_calendar(name, url, self.chrome_options, days_to_keep=150)
-        
-        if name == "USA_ISM_New_Orders":
-            return selenium_scrapers_investing.fetch_investing_economic_calendar(name, url, self.chrome_options, days_to_keep=365)
-        
-        if name == "Fed_Rate_Monitor":
-            return selenium_scrapers_investing.fetch_fed_rate_monitor(name, url, self.chrome_options)
-
-        # 3. 专用抓取逻辑 (其他来源)
-        if name == "CNN_FearGreed":
-            return selenium_scrapers_misc.fetch_cnn_fear_greed(name, url, self.chrome_options)
-            
-        if name == "CBOE_PutCallRatio":
-            return selenium_scrapers_misc.fetch_cboe_data(name, url, self.chrome_options)
-            
-        if name == "CCFI_运价指数":
-            return selenium_scrapers_misc.fetch_ccfi_data(name, url, self.chrome_options)
-            
-        if name == "Insider_BuySell_Ratio_USA":
-            return selenium_scrapers_misc.fetch_gurufocus_insider_ratio(name, url, self.chrome_options)
-
-        # 4. 默认通用抓取 (Eastmoney 等)
-        days_to_keep = 30 if "南向资金" in name else 180
-        return selenium_scrapers_misc.fetch_generic_source(name, url, self.chrome_options, days_to_keep)
+        def resolve_then_warm():
+            try:
+                self.browser_jobs = self.resolve_without_browser()
+            except Exception as e:
+                print(f"⚠️ [Scraper] 预热阶段直连抓取失败，将在 Step 2 重试: {str(e)[:100]}")
+                return
+            urls = [self.browser_jobs[name] for name in selenium_registry.schedule_order(self.browser_jobs)]
+            self.driver_pool.warm_async(urls)
 
-    def run_concurrent(self):
-        print("🚀 [Scraper] 正在并发抓取宏观数据 (Workers=2)...")
+        self.resolver = threading.Thread(target=resolve_then_warm, daemon=True)
+        self.resolver.start()
+        return self.resolver
+
+    def record_result(self, name, data, error_msg):
+        """记录单个数据源的抓取结果，成功时同时更新发布日历缓存"""
+        if not error_msg:
+            self.results[name] = data
+            self.cache.update(name, data)
+            self.status_logs.append({'name': name, 'status': True, 'error': None})
+        else:
+            self.results[name] = []
+            self.status_logs.append({'name': name, 'status': False, 'error': error_msg})
+
+    def resolve_without_browser(self):
+        """
+        无需浏览器的阶段: 月度/周度指标在下一个预期发布日之前直接使用缓存，
+        有接口/HTTP 直连的数据源并发直连；返回仍需浏览器抓取的 {name: url} (含直连失败需回退的)
+        """
         self.status_logs = []
-        
-        with ThreadPoolExecutor(max_workers=2) as executor:
-            future_to_name = {
-                executor.submit(self.fetch_single_source, name, url): name 
-                for name, url in self.targets.items()
-            }
-            for future in as_completed(future_to_name):
-                name, data, error_msg = future.result()
-                if not error_msg:
-                    self.results[name] = data
-                    self.status_logs.append({'name': name, 'status': True, 'error': None})
-                else:
-                    self.results[name] = []
-                    self.status_logs.append({'name': name, 'status': False, 'error': error_msg})
-                    
+        pending = {}
+        for name, url in self.targets.items():
+            cached = self.cache.get_fresh(name)
+            if cached is not None:
+                self.results[name] = cached
+                self.status_logs.append({'name': name, 'status': True, 'error': None})
+            else:
+                pending[name] = url
+        if len(pending) < len(self.targets):
+            print(f"🗄️ [Scraper] {len(self.targets) - len(pending)} 个指标未到发布日，使用缓存")
+
+        fast = [name for name in pending if selenium_registry.has_fast_path(name)]
+        browser_jobs = {name: url for name, url in pending.items() if name not in fast}
+        if fast:
+            # 纯 HTTP 任务使用独立的调优键与线程池，不受浏览器池容量限制
+            keys = [concurrency_tuner.http_key(pending[name]) for name in fast]
+            max_workers = self.tuner.max_workers(keys)
+            print(f"⚡ [Scraper] 直连抓取 {len(fast)} 个指标 (Workers={max_workers})...")
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                future_to_name = {
+                    executor.submit(self.fetch_with_tuning, name, pending[name], browser=False): name
+                    for name in selenium_registry.schedule_order(fast, fast=True)
+                }
+                for future in as_completed(future_to_name):
+                    name, data, error_msg = future.result()
+                    if not error_msg:
+                        self.record_result(name, data, None)
+                    else:
+                        print(f"↩️ [{name}] 回退到 Selenium 抓取...")
+                        browser_jobs[name] = pending[name]
+        return browser_jobs
+
+    def fetch_single_source(self, name, url, browser=True):
+        """
+        调度器：按注册表分发到具体的 scraper 函数；browser=False 时执行接口/HTTP 直连
+        """
+        if not browser:
+            return selenium_registry.fetch_fast_path(name, url)
+        spec = selenium_registry.get_source(name)
+        return spec["scraper"](name, url, self.driver_pool, max_retries=spec["retries"], page_timeout=spec["timeout"], **spec["kwargs"])
+
+    def fetch_with_tuning(self, name, url, browser=True):
+        """按主机占用并发名额，并将耗时/错误/限流信号反馈给 tuner (直连任务使用独立的 http: 调优键)"""
+        host = concurrency_tuner.host_key(url) if browser else concurrency_tuner.http_key(url)
+        page_timeout = selenium_registry.get_source(name)["timeout"]
+        with self.tuner.slot(host), self.watchdog.task(name, page_timeout):
+            start = time.time()
+            try:
+                result = self.fetch_single_source(name, url, browser=browser)
+            except Exception as e:
+                self.tuner.record(host, time.time() - start, ok=False, throttled=concurrency_tuner.is_throttle_error(e))
+                return name, [], str(e)
+            error_msg = result[2]
+            self.tuner.record(host, time.time() - start, ok=not error_msg, throttled=concurrency_tuner.is_throttle_error(error_msg))
+            return result
+
+    def run_concurrent(self):
+        try:
+            # prewarm() 已在后台完成缓存与直连阶段时直接取其结果
+            if self.resolver is not None:
+                self.resolver.join()
+            pending = self.browser_jobs
+            if pending is None:
+                pending = self.resolve_without_browser()
+            self.resolver, self.browser_jobs = None, None
+
+            if pending:
+                hosts = [concurrency_tuner.host_key(url) for url in pending.values()]
+                max_workers = self.tuner.max_workers(hosts, cap=self.driver_pool.capacity)
+                print(f"🚀 [Scraper] 正在并发抓取宏观数据 ({len(pending)} 个需浏览器, Workers={max_workers})...")
+                with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                    # 预期耗时最长的页面最先提交 (LPT)，避免慢页面最后才开始拖长尾部
+                    future_to_name = {
+                        executor.submit(self.fetch_with_tuning, name, pending[name]): name
+                        for name in selenium_registry.schedule_order(pending)
+                    }
+                    for future in as_completed(future_to_name):
+                        self.record_result(*future.result())
+        finally:
+            # 关闭前采样一次，记录抓取结束时仍在运行的浏览器
+            self.watchdog.sample()
+            self.driver_pool.close()
+            self.watchdog.sweep()
+            selenium_parse.shutdown()
+
+        watchdog_log = self.watchdog.status_log()
+        if watchdog_log:
+            self.status_logs.append(watchdog_log)
+
+        self.run_metrics = self.pool_metrics()
+        self.tuner.save()
+        self.cache.save()
+        page_archive.prune()
         return self.results, self.status_logs
 
+    def pool_metrics(self):
+        """浏览器池运行指标: 池大小与估算依据、当前/峰值浏览器数与内存；并用实测单浏览器内存更新下次估算"""
+        usage = dict(self.watchdog.usage)
+        footprint = selenium_resources.save_footprint(usage["per_browser_mb"])
+        print(f"📈 [Scraper] 浏览器峰值 {usage['peak_browsers']} 个 / 内存峰值 {usage['peak_memory_mb']:.0f}MB "
+              f"(单个约 {usage['per_browser_mb']:.0f}MB)")
+        return {
+            "pool_size": self.driver_pool.size,
+            "capacity": self.driver_pool.capacity,
+            "sizing": self.sizing,
+            **usage,
+            "next_footprint_mb": footprint,
+            **self.driver_pool.metrics,
+        }
+
     def organize_data(self):
         nested_data = {
             "china": {},
@@ -0,0 +1,90 @@
+# selenium_parse.py
+# -----------------------------------------------------------------------------
+# DeepSeek Finance Project - Out-of-Thread Payload Parsing
+# scraper 取回页面数据 (表格单元格文本 / JSON) 后立即归还浏览器，
+# 构造 DataFrame 与清洗记录交给进程池完成，避免浏览器空等解析、解析线程与调度线程争抢 GIL
+# -----------------------------------------------------------------------------
+
+import os
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import page_archive
+
+# MARKETRADAR_PARSE_WORKERS=0 在抓取线程内直接解析 (不启动进程池)
+PARSE_WORKERS = int(os.environ.get("MARKETRADAR_PARSE_WORKERS", str(min(2, os.cpu_count() or 1))))
+
+_LOCK = threading.Lock()
+_EXECUTOR = None
+_DISABLED = PARSE_WORKERS <= 0
+
+def _noop():
+    return None
+
+def _executor():
+    global _EXECUTOR, _DISABLED
+    with _LOCK:
+        if _DISABLED:
+            return None
+        if _EXECUTOR is None:
+            try:
+                # 抓取线程仍在运行时 fork 不安全，使用 forkserver/spawn 启动解析进程
+                methods = multiprocessing.get_all_start_methods()
+                context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+                _EXECUTOR = ProcessPoolExecutor(max_workers=PARSE_WORKERS, mp_context=context)
+            except Exception as e:
+                print(f"⚠️ [Parse] 解析进程池启动失败，改为线程内解析: {str(e)[:100]}")
+                _DISABLED = True
+        return _EXECUTOR
+
+def _submit(func, args):
+    """
+    提交到进程池；进程池不可用时返回 None
+    在锁内提交: _disable / shutdown 先在锁内摘下进程池再关闭，因此不会提交到已关闭的进程池
+    """
+    executor = _executor()
+    if executor is None:
+        return None
+    with _LOCK:
+        if _EXECUTOR is not executor:
+            return None
+        return executor.submit(func, *args)
+
+def _disable(reason):
+    global _EXECUTOR, _DISABLED
+    with _LOCK:
+        executor, _EXECUTOR, _DISABLED = _EXECUTOR, None, True
+    print(f"⚠️ [Parse] 解析进程池不可用，改为线程内解析: {str(reason)[:100]}")
+    if executor:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+def start():
+    """提前启动解析进程 (与浏览器预热重叠)，避免首个页面解析时才承担进程启动耗时"""
+    for _ in range(PARSE_WORKERS):
+        if _submit(_noop, ()) is None:
+            break
+
+def run(func, *args, source=None):
+    """
+    在解析进程中执行 func(*args) 并返回结果 (func 与参数需可 pickle，即模块级函数 + 基本类型数据)
+    func 自身抛出的异常原样抛出；进程池不可用时在当前线程执行
+    source: 数据源名称，给出时先将原始数据归档 (page_archive)，便于日后以新解析逻辑重放
+    """
+    if source:
+        page_archive.record(source, func, args)
+    try:
+        future = _submit(func, args)
+        if future is None:
+            return func(*args)
+        return future.result()
+    except BrokenProcessPool as e:
+        _disable(e)
+        return func(*args)
+
+def shutdown():
+    global _EXECUTOR
+    with _LOCK:
+        executor, _EXECUTOR = _EXECUTOR, None
+    if executor:
+        executor.shutdown(wait=True)
@@ -0,0 +1,664 @@
+# selenium_pool.py
+# -----------------------------------------------------------------------------
+# DeepSeek Finance Project - Reusable WebDriver Pool
+# 由 MacroDataScraper 持有的长生命周期 Headless Chrome 池：
+# 借出前做健康检查，归还时清理 Cookie/缓存/存储，服务 N 个页面后回收重建
+# -----------------------------------------------------------------------------
+
+import os
+import copy
+import json
+import time
+import atexit
+import shutil
+import threading
+from selenium import webdriver
+from selenium.common.exceptions import TimeoutException, SessionNotCreatedException
+import selenium_capture
+import selenium_service
+import concurrency_tuner
+import utils
+
+# 单个 Chrome 实例最多服务的页面数，超过后回收 (避免内存泄漏/指纹积累)
+MAX_PAGES_PER_DRIVER = 8
+
+HIDE_WEBDRIVER_JS = """Object.defineProperty(navigator, 'webdriver', {get: () => undefined})"""
+
+# 资源拦截规则 (Network.setBlockedURLs 通配符)，按主机选择，"*" 为默认规则
+# 注意不要拦截 selenium_capture 依赖的数据接口 (api.investing.com / dataviz.cnn.io / cdn.cboe.com)
+BLOCK_FONTS_MEDIA = [
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",
+    "*.mp4", "*.webm", "*.m3u8", "*.mp3",
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico",
+]
+BLOCK_TRACKERS = [
+    "*googletagmanager.com*", "*google-analytics.com*", "*doubleclick.net*",
+    "*googlesyndication.com*", "*adservice.google.*", "*amazon-adsystem.com*",
+    "*facebook.net*", "*scorecardresearch.com*", "*quantserve.com*", "*chartbeat.*",
+    "*hotjar.com*", "*optimizely.com*", "*taboola.com*", "*outbrain.com*",
+    "*criteo.*", "*pubmatic.com*", "*rubiconproject.com*", "*adnxs.com*",
+    "*casalemedia.com*", "*moatads.com*", "*bounceexchange.com*", "*hm.baidu.com*",
+]
+BLOCK_RULES = {
+    "*": BLOCK_FONTS_MEDIA + BLOCK_TRACKERS,
+    # 表格由脚本渲染，样式表与视频播放器均用不到
+    "investing.com": BLOCK_FONTS_MEDIA + BLOCK_TRACKERS + ["*.css", "*.css?*", "*jwplayer*", "*connatix*", "*primis*"],
+    "cnn.com": BLOCK_FONTS_MEDIA + BLOCK_TRACKERS + ["*.css", "*.css?*", "*bitmovin*", "*fave.api.cnn.io*", "*warpdrive*"],
+}
+
+# MARKETRADAR_BLOCK_RESOURCES=0 关闭资源拦截 (排查页面异常时使用)
+BLOCKING_ENABLED = os.environ.get("MARKETRADAR_BLOCK_RESOURCES", "1") != "0"
+
+# 持久化 Chrome 配置目录 (磁盘缓存 + 同意弹窗 Cookie 跨运行保留)，默认关闭
+# MARKETRADAR_CHROME_PROFILE=1 开启；按数据源主机 (family) + 池内槽位隔离，避免多个 Chrome 争用同一目录
+PROFILE_ENABLED = os.environ.get("MARKETRADAR_CHROME_PROFILE", "0") == "1"
+PROFILE_ROOT = os.environ.get("MARKETRADAR_CHROME_PROFILE_DIR") or os.path.join(utils.STATE_DIR, "chrome_profiles")
+PROFILE_MAX_MB = int(os.environ.get("MARKETRADAR_CHROME_PROFILE_MAX_MB", "512"))
+PROFILE_DISK_CACHE_MB = 64
+# 超出总容量时优先删除的缓存子目录 (保留 Cookies 等小文件)
+PROFILE_CACHE_DIRS = [
+    os.path.join("Default", "Cache"),
+    os.path.join("Default", "Code Cache"),
+    os.path.join("Default", "GPUCache"),
+    os.path.join("Default", "Service Worker", "CacheStorage"),
+    "ShaderCache", "GrShaderCache",
+]
+PROFILE_LOCK_FILES = ["SingletonLock", "SingletonSocket", "SingletonCookie"]
+
+def _dir_size(path):
+    total = 0
+    for root, _, files in os.walk(path):
+        for f in files:
+            try:
+                total += os.lstat(os.path.join(root, f)).st_size
+            except OSError:
+                pass
+    return total
+
+def cleanup_profiles(root=PROFILE_ROOT, max_mb=PROFILE_MAX_MB):
+    """
+    控制持久化配置目录的总大小: 按最近使用时间从旧到新，先清理缓存子目录，仍超限再整个删除
+    """
+    if not os.path.isdir(root):
+        return
+    slots = [os.path.join(root, family, slot) for family in os.listdir(root)
+             if os.path.isdir(os.path.join(root, family))
+             for slot in os.listdir(os.path.join(root, family))]
+    slots = [p for p in slots if os.path.isdir(p)]
+    sizes = {p: _dir_size(p) for p in slots}
+    total = sum(sizes.values())
+    limit = max_mb * 1024 * 1024
+    if total <= limit:
+        return
+
+    lru = sorted(slots, key=os.path.getmtime)
+    for path in lru:
+        for sub in PROFILE_CACHE_DIRS:
+            shutil.rmtree(os.path.join(path, sub), ignore_errors=True)
+        new_size = _dir_size(path)
+        total -= sizes[path] - new_size
+        sizes[path] = new_size
+        if total <= limit:
+            break
+    for path in lru:
+        if total <= limit:
+            break
+        shutil.rmtree(path, ignore_errors=True)
+        total -= sizes[path]
+    print(f"🧹 [DriverPool] 配置目录已清理至 {total / 1024 / 1024:.0f}MB (上限 {max_mb}MB)")
+
+class WebDriverPool:
+    def __init__(self, chrome_options, size=2, max_pages=MAX_PAGES_PER_DRIVER, block_rules=None, persistent_profile=None, watchdog=None):
+        self.chrome_options = chrome_options
+        self.watchdog = watchdog    # 可选: selenium_core.BrowserWatchdog，跟踪进程与单页硬性时限
+        self.block_rules = BLOCK_RULES if block_rules is None else block_rules
+        self.size = size
+        self.max_pages = max_pages
+        self.persistent = PROFILE_ENABLED if persistent_profile is None else persistent_profile
+
+        self.slots = threading.BoundedSemaphore(size)
+        self.lock = threading.Lock()
+        self.cond = threading.Condition(self.lock)
+        self.idle = []
+        self.warming = {}       # family -> 后台预热中的实例数
+        self.info = {}          # id(driver) -> {"pages": 已服务页面数, "family": 主机, "slot": 配置目录槽位}
+        self.profile_slots = {} # family -> 正在使用的槽位集合
+        self.metrics = {"created": 0, "reused": 0, "recycled": 0, "discarded": 0}
+
+        if self.persistent:
+            cleanup_profiles()
+
+    @property
+    def capacity(self):
+        """可同时借出的 driver 数"""
+        return self.size
+
+    def _family(self, url):
+        # 非持久化模式下所有 driver 通用，不区分来源
+        if not self.persistent:
+            return None
+        return concurrency_tuner.host_key(url) if url else "default"
+
+    def _options_for(self, family):
+        """为 family 分配一个空闲槽位，返回 (options, slot)"""
+        if family is None:
+            return self.chrome_options, None
+        with self.lock:
+            used = self.profile_slots.setdefault(family, set())
+            slot = next(i for i in range(self.size + 1) if i not in used)
+            used.add(slot)
+
+        path = os.path.abspath(os.path.join(PROFILE_ROOT, family, f"slot_{slot}"))
+        os.makedirs(path, exist_ok=True)
+        # 上次异常退出残留的锁文件会导致 "user data directory is already in use"
+        for name in PROFILE_LOCK_FILES:
+            try:
+                os.remove(os.path.join(path, name))
+            except OSError:
+                pass
+        os.utime(path)
+
+        options = copy.deepcopy(self.chrome_options)
+        options.add_argument(f"--user-data-dir={path}")
+        options.add_argument(f"--disk-cache-size={PROFILE_DISK_CACHE_MB * 1024 * 1024}")
+        return options, slot
+
+    def _launch(self, options):
+        """启动 Chrome；会话创建失败 (缓存的驱动与升级后的 Chrome 不匹配) 时重新解析驱动路径再试一次"""
+        service = selenium_service.prepare(options)
+        try:
+            return webdriver.Chrome(options=options, service=service)
+        except SessionNotCreatedException:
+            if not selenium_service.invalidate(service):
+                raise
+        return webdriver.Chrome(options=options, service=selenium_service.prepare(options))
+
+    def _create(self, family):
+        options, slot = self._options_for(family)
+        try:
+            driver = self._launch(options)
+            driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": HIDE_WEBDRIVER_JS})
+        except Exception:
+            self._free_slot(family, slot)
+            raise
+        if self.watchdog:
+            self.watchdog.register(driver)
+        with self.lock:
+            self.info[id(driver)] = {"pages": 0, "family": family, "slot": slot}
+            self.metrics["created"] += 1
+        return driver
+
+    def _free_slot(self, family, slot):
+        if slot is not None:
+            with self.lock:
+                self.profile_slots.get(family, set()).discard(slot)
+
+    def _quit(self, driver):
+        with self.lock:
+            info = self.info.pop(id(driver), {})
+        try:
+            driver.quit()
+        except:
+            pass
+        if self.watchdog:
+            self.watchdog.reap(driver)
+        self._free_slot(info.get("family"), info.get("slot"))
+
+    def _is_healthy(self, driver):
+        try:
+            return driver.execute_script("return 1") == 1
+        except Exception:
+            return False
+
+    def _reset(self, driver):
+        """
+        清理上一个页面留下的状态并回到空白页
+        持久化模式下保留 Cookie 与磁盘缓存 (这正是持久化的目的)，只关闭多余窗口
+        """
+        handles = driver.window_handles
+        for handle in handles[1:]:
+            driver.switch_to.window(handle)
+            driver.close()
+        driver.switch_to.window(handles[0])
+
+        if not self.persistent:
+            origin = driver.execute_script("return window.location.origin")
+            if origin and origin.startswith("http"):
+                driver.execute_cdp_cmd("Storage.clearDataForOrigin", {"origin": origin, "storageTypes": "all"})
+            driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+            driver.execute_cdp_cmd("Network.clearBrowserCache", {})
+        driver.get("about:blank")
+        selenium_capture.drain(driver)
+
+    def _apply_blocking(self, driver, url):
+        """按目标主机设置资源拦截列表 (每次借出都会覆盖上一次的规则)"""
+        patterns = []
+        if BLOCKING_ENABLED and self.block_rules:
+            host = concurrency_tuner.host_key(url) if url else None
+            patterns = self.block_rules.get(host, self.block_rules.get("*", []))
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": list(patterns)})
+
+    def _take_idle(self, family):
+        """取出同一 family 的空闲 driver；若实例总数已达上限，先关闭一个其他 family 的空闲实例"""
+        evict = None
+        with self.lock:
+            for i in range(len(self.idle) - 1, -1, -1):
+                if self.info.get(id(self.idle[i]), {}).get("family") == family:
+                    return self.idle.pop(i), None
+            if self.idle and len(self.info) >= self.size:
+                evict = self.idle.pop(0)
+        return None, evict
+
+    def acquire(self, url=None):
+        """借出一个可用的 driver (池满时阻塞等待)，并应用 url 所属主机的资源拦截规则"""
+        family = self._family(url)
+        with self.cond:
+            # 同一 family 正在后台预热时，先等待其完成 (不占用名额) 而不是另起一个 Chrome
+            while self.warming.get(family) and not any(
+                    self.info.get(id(d), {}).get("family") == family for d in self.idle):
+                self.cond.wait()
+        self.slots.acquire()
+        try:
+            while True:
+                driver, evict = self._take_idle(family)
+                if evict is not None:
+                    self._quit(evict)
+                if driver is None:
+                    driver = self._create(family)
+                elif self._is_healthy(driver):
+                    with self.lock:
+                        self.metrics["reused"] += 1
+                else:
+                    with self.lock:
+                        self.metrics["discarded"] += 1
+                    self._quit(driver)
+                    continue
+                try:
+                    self._apply_blocking(driver, url)
+                except Exception:
+                    self._quit(driver)
+                    raise
+                if self.watchdog:
+                    self.watchdog.page_started(driver, driver)
+                return driver
+        except Exception:
+            self.slots.release()
+            raise
+
+    def release(self, driver, discard=False):
+        """归还 driver: 达到页面上限、重置失败或调用方要求时直接销毁"""
+        if self.watchdog:
+            self.watchdog.page_finished(driver)
+        try:
+            with self.lock:
+                info = self.info.setdefault(id(driver), {"pages": 0, "family": None, "slot": None})
+                info["pages"] += 1
+                recycle = info["pages"] >= self.max_pages
+
+            if discard:
+                with self.lock:
+                    self.metrics["discarded"] += 1
+                self._quit(driver)
+                return
+            if recycle:
+                with self.lock:
+                    self.metrics["recycled"] += 1
+                self._quit(driver)
+                return
+
+            try:
+                self._reset(driver)
+            except Exception:
+                with self.lock:
+                    self.metrics["discarded"] += 1
+                self._quit(driver)
+                return
+
+            with self.cond:
+                self.idle.append(driver)
+                self.cond.notify_all()
+        finally:
+            self.slots.release()
+
+    def _warm_one(self, url):
+        family = self._family(url)
+        try:
+            with self.slots:
+                driver = self._create(family)
+                with self.cond:
+                    self.idle.append(driver)
+        except Exception as e:
+            print(f"⚠️ [DriverPool] 预热失败: {str(e)[:100]}")
+        finally:
+            with self.cond:
+                self.warming[family] -= 1
+                self.cond.notify_all()
+
+    def warm_async(self, urls):
+        """
+        在后台线程中提前启动 Chrome (每个 url 一个，最多 size 个，按 urls 对应的 family)，
+        使浏览器启动与其他步骤重叠；acquire 遇到同 family 的预热实例会等待并直接复用
+        urls 为空 (全部命中缓存或直连) 时不启动任何实例
+        """
+        urls = list(urls)[:self.size]
+        if not urls:
+            return []
+        threads = []
+        with self.cond:
+            for url in urls:
+                family = self._family(url)
+                self.warming[family] = self.warming.get(family, 0) + 1
+        for url in urls:
+            t = threading.Thread(target=self._warm_one, args=(url,), daemon=True)
+            t.start()
+            threads.append(t)
+        # 若后续步骤未使用该池，退出时关闭已预热的实例
+        atexit.register(lambda: self.idle and self.close())
+        print(f"🔥 [DriverPool] 后台预热 {len(urls)} 个浏览器实例...")
+        return threads
+
+    def close(self):
+        """关闭所有空闲实例 (之后再次 acquire 会按需重新创建)"""
+        with self.lock:
+            drivers, self.idle = self.idle, []
+        for driver in drivers:
+            self._quit(driver)
+        if self.persistent:
+            cleanup_profiles()
+        m = self.metrics
+        print(f"🧹 [DriverPool] 已关闭: 新建 {m['created']} / 复用 {m['reused']} / 回收 {m['recycled']} / 丢弃 {m['discarded']}")
+
+# -----------------------------------------------------------------------------
+# 多标签页模式: 一个 Chrome 进程同时服务多个数据源，每个数据源独占一个标签页
+# MARKETRADAR_TABS_PER_BROWSER>1 时启用 (默认 1，即每个数据源独占一个 Chrome)
+# -----------------------------------------------------------------------------
+
+TABS_PER_BROWSER = max(1, int(os.environ.get("MARKETRADAR_TABS_PER_BROWSER", "1")))
+TAB_BROWSERS = max(1, int(os.environ.get("MARKETRADAR_TAB_BROWSERS", "1")))
+TAB_POLL_INTERVAL = 0.2
+
+# 后台标签页默认会被节流，导致并发加载退化为串行
+TAB_MODE_ARGUMENTS = [
+    "--disable-background-timer-throttling",
+    "--disable-renderer-backgrounding",
+    "--disable-backgrounding-occluded-windows",
+]
+
+def _target_id(handle):
+    # 新版 chromedriver 的窗口句柄即 CDP targetId，旧版带 "CDwindow-" 前缀
+    return handle.replace("CDwindow-", "")
+
+class SharedBrowser:
+    """被多个 TabHandle 共享的 Chrome 实例: WebDriver 会话同一时刻只能操作一个窗口，所有命令经 lock 串行化"""
+    def __init__(self, driver, slot=None):
+        self.driver = driver
+        self.slot = slot
+        self.lock = threading.RLock()
+        self.base_handle = driver.current_window_handle
+        self.tabs = {}          # handle -> TabHandle
+        self.pending = 0        # 已分配但尚未打开的标签页
+        self.perf_events = {}   # targetId -> 该标签页尚未读取的 performance 日志
+        self.pages = 0
+
+    def open_tab(self):
+        with self.lock:
+            self.driver.switch_to.new_window('tab')
+            handle = self.driver.current_window_handle
+            self.driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": HIDE_WEBDRIVER_JS})
+            tab = TabHandle(self, handle)
+            self.tabs[handle] = tab
+            self.perf_events[_target_id(handle)] = []
+            return tab
+
+    def close_tab(self, tab, clear_state=True):
+        with self.lock:
+            self.tabs.pop(tab.handle, None)
+            self.perf_events.pop(_target_id(tab.handle), None)
+            self.pages += 1
+            self.driver.switch_to.window(tab.handle)
+            self.driver.close()
+            self.driver.switch_to.window(self.base_handle)
+            # 没有其他标签页在使用时才清理 Cookie/缓存，避免影响正在加载的页面
+            if clear_state and not self.tabs:
+                self.driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+                self.driver.execute_cdp_cmd("Network.clearBrowserCache", {})
+
+    def collect_perf_log(self):
+        """performance 日志是会话级的，按 webview (即窗口句柄) 分发给各标签页"""
+        with self.lock:
+            for entry in self.driver.get_log("performance"):
+                try:
+                    webview = json.loads(entry["message"]).get("webview")
+                except (KeyError, ValueError):
+                    continue
+                webview = _target_id(webview or "")
+                if webview in self.perf_events:
+                    self.perf_events[webview].append(entry)
+
+    def is_healthy(self):
+        try:
+            with self.lock:
+                self.driver.switch_to.window(self.base_handle)
+                return self.driver.execute_script("return 1") == 1
+        except Exception:
+            return False
+
+    def quit(self):
+        try:
+            self.driver.quit()
+        except:
+            pass
+
+class TabHandle:
+    """
+    单个标签页的 driver 代理，提供 scraper 用到的 WebDriver 接口子集
+    导航通过 JS 发起 (不阻塞会话)，加载等待在锁外轮询，因此多个标签页可以同时加载
+    """
+    def __init__(self, browser, handle):
+        self.browser = browser
+        self.handle = handle
+        self.page_load_timeout = 60
+
+    def _run(self, func, *args):
+        with self.browser.lock:
+            if self.browser.driver.current_window_handle != self.handle:
+                self.browser.driver.switch_to.window(self.handle)
+            return func(*args)
+
+    def get(self, url):
+        driver = self.browser.driver
+        self._run(driver.execute_script, "window.location.href = arguments[0];", url)
+        deadline = time.time() + self.page_load_timeout
+        while time.time() < deadline:
+            href, state = self._run(driver.execute_script, "return [window.location.href, document.readyState];")
+            if href != "about:blank" and state in ("interactive", "complete"):
+                return
+            time.sleep(TAB_POLL_INTERVAL)
+        raise TimeoutException(f"标签页加载超时 ({self.page_load_timeout}s): {url}")
+
+    def execute_script(self, script, *args):
+        return self._run(self.browser.driver.execute_script, script, *args)
+
+    def execute_cdp_cmd(self, cmd, params):
+        return self._run(self.browser.driver.execute_cdp_cmd, cmd, params)
+
+    def get_log(self, log_type):
+        if log_type != "performance":
+            return self._run(self.browser.driver.get_log, log_type)
+        self.browser.collect_perf_log()
+        target = _target_id(self.handle)
+        with self.browser.lock:
+            events = self.browser.perf_events.get(target, [])
+            self.browser.perf_events[target] = []
+        return events
+
+    @property
+    def page_source(self):
+        return self._run(lambda: self.browser.driver.page_source)
+
+    @property
+    def title(self):
+        return self._run(lambda: self.browser.driver.title)
+
+    def set_page_load_timeout(self, seconds):
+        # 每个标签页独立的加载超时
+        self.page_load_timeout = seconds
+
+    def set_script_timeout(self, seconds):
+        pass
+
+    def set_window_size(self, width, height):
+        # 标签页共享窗口大小，由浏览器统一设置
+        pass
+
+class MultiTabPool(WebDriverPool):
+    """size 个 Chrome 进程，每个最多同时打开 tabs_per_browser 个标签页"""
+    def __init__(self, chrome_options, size=1, tabs_per_browser=TABS_PER_BROWSER, **kwargs):
+        options = copy.deepcopy(chrome_options)
+        for arg in TAB_MODE_ARGUMENTS:
+            options.add_argument(arg)
+        # 由 TabHandle.get 自行等待加载，避免 chromedriver 在导航期间阻塞整个会话
+        options.page_load_strategy = 'none'
+        super().__init__(options, size=size, **kwargs)
+        self.tabs_per_browser = tabs_per_browser
+        self.slots = threading.BoundedSemaphore(size * tabs_per_browser)
+        self.browsers = []      # SharedBrowser，创建中的以 None 占位
+        self.metrics["tabs"] = 0
+
+    @property
+    def capacity(self):
+        return self.size * self.tabs_per_browser
+
+    def _new_browser(self):
+        family = "multi_tab" if self.persistent else None
+        driver = self._create(family)
+        driver.set_window_size(1920, 1080)
+        return SharedBrowser(driver, self.info.get(id(driver), {}).get("slot"))
+
+    def _start_browser(self):
+        """在占位符上创建浏览器 (调用前已在 self.browsers 中追加 None 占位，防止并发超额创建)"""
+        try:
+            browser = self._new_browser()
+        except Exception:
+            with self.cond:
+                self.browsers.remove(None)
+                self.cond.notify_all()
+            raise
+        with self.cond:
+            self.browsers[self.browsers.index(None)] = browser
+            self.cond.notify_all()
+        return browser
+
+    def _pick_browser(self):
+        """选择标签页最少的健康浏览器并预留一个标签页名额，不足时新建"""
+        while True:
+            with self.cond:
+                ready = [b for b in self.browsers if b is not None and len(b.tabs) + b.pending < self.tabs_per_browser]
+                if not ready and len(self.browsers) >= self.size:
+                    # 其他线程正在创建浏览器或关闭标签页，等待后重试
+                    self.cond.wait()
+                    continue
+                if ready:
+                    browser = min(ready, key=lambda b: len(b.tabs) + b.pending)
+                    browser.pending += 1
+                else:
+                    browser = None
+                    self.browsers.append(None)
+            if browser is None:
+                browser = self._start_browser()
+                with self.cond:
+                    browser.pending += 1
+                return browser
+            if browser.is_healthy():
+                return browser
+            with self.cond:
+                browser.pending -= 1
+            self._drop_browser(browser)
+
+    def _drop_browser(self, browser):
+        with self.lock:
+            if browser in self.browsers:
+                self.browsers.remove(browser)
+        self._quit(browser.driver)
+
+    def acquire(self, url=None):
+        self.slots.acquire()
+        try:
+            browser = self._pick_browser()
+            try:
+                tab = browser.open_tab()
+            finally:
+                with self.cond:
+                    browser.pending -= 1
+            try:
+                self._apply_blocking(tab, url)
+            except Exception:
+                browser.close_tab(tab)
+                raise
+            with self.lock:
+                self.metrics["tabs"] += 1
+            if self.watchdog:
+                self.watchdog.page_started(tab, browser.driver)
+            return tab
+        except Exception:
+            self.slots.release()
+            raise
+
+    def release(self, tab, discard=False):
+        browser = tab.browser
+        if self.watchdog:
+            self.watchdog.page_finished(tab)
+        try:
+            try:
+                browser.close_tab(tab, clear_state=not self.persistent)
+            except Exception:
+                discard = True
+            # 浏览器空闲且服务页面数达到上限时整体回收
+            if discard or (not browser.tabs and browser.pages >= self.max_pages * self.tabs_per_browser):
+                with self.lock:
+                    self.metrics["discarded" if discard else "recycled"] += 1
+                self._drop_browser(browser)
+        finally:
+            with self.cond:
+                self.cond.notify_all()
+            self.slots.release()
+
+    def warm_async(self, urls):
+        """按 urls 数量预热浏览器 (每个浏览器承载 tabs_per_browser 个标签页，最多 size 个)"""
+        def warm():
+            try:
+                self._start_browser()
+            except Exception as e:
+                print(f"⚠️ [DriverPool] 预热失败: {str(e)[:100]}")
+        with self.cond:
+            needed = -(-len(list(urls)) // self.tabs_per_browser)
+            count = max(0, min(self.size - len(self.browsers), needed))
+            self.browsers.extend([None] * count)
+        if not count:
+            return []
+        threads = [threading.Thread(target=warm, daemon=True) for _ in range(count)]
+        for t in threads:
+            t.start()
+        atexit.register(lambda: self.browsers and self.close())
+        print(f"🔥 [DriverPool] 后台预热 {count} 个浏览器 (每个 {self.tabs_per_browser} 个标签页)...")
+        return threads
+
+    def close(self):
+        with self.lock:
+            idle = [b for b in self.browsers if b is not None and not b.tabs and not b.pending]
+        for browser in idle:
+            self._drop_browser(browser)
+        if self.persistent:
+            cleanup_profiles()
+        m = self.metrics
+        print(f"🧹 [DriverPool] 已关闭: 浏览器 {m['created']} / 标签页 {m['tabs']} / 回收 {m['recycled']} / 丢弃 {m['discarded']}")
+
+def create_pool(chrome_options, size=2, **kwargs):
+    """
+    按 MARKETRADAR_TABS_PER_BROWSER 选择单标签页池或多标签页池
+    多标签页模式下浏览器数量由 MARKETRADAR_TAB_BROWSERS 决定 (默认 1)，size 参数不再适用
+    """
+    if TABS_PER_BROWSER > 1:
+        return MultiTabPool(chrome_options, size=TAB_BROWSERS, tabs_per_browser=TABS_PER_BROWSER, **kwargs)
+    return WebDriverPool(chrome_options, size=size, **kwargs)
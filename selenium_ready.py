@@ -0,0 +1,85 @@
+# selenium_ready.py
+# -----------------------------------------------------------------------------
+# DeepSeek Finance Project - Page Readiness Predicates
+# 以短间隔轮询数据源专属的就绪条件 (目标表头出现且行数达标 / 关键文本出现 / 网络空闲)，
+# 条件满足即开始解析，替代固定 sleep + 通用等待
+# -----------------------------------------------------------------------------
+
+import re
+import time
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.support.ui import WebDriverWait
+
+POLL_INTERVAL = 0.2
+
+# arguments: [keyword_groups, min_rows, search_first_row]
+TABLE_READY_JS = r"""
+const groups = arguments[0], minRows = arguments[1], firstRow = arguments[2];
+const key = s => (s || '').replace(/\s+/g, '').toLowerCase();
+const cellsOf = r => Array.from(r.cells).map(c => key(c.textContent));
+for (const table of document.querySelectorAll('table')) {
+    if (!table.rows.length) continue;
+    const headRows = table.tHead ? Array.from(table.tHead.rows) : [table.rows[0]];
+    let labels = [].concat(...headRows.map(cellsOf));
+    const tbody = table.tBodies[0];
+    if (firstRow && tbody && tbody.rows.length) labels = labels.concat(cellsOf(tbody.rows[0]));
+    if (!groups.some(g => g.every(k => labels.some(l => l.includes(key(k)))))) continue;
+    let n = 0;
+    for (const b of table.tBodies) n += b.rows.length;
+    if (!table.tHead) n -= 1;
+    if (n >= minRows) return true;
+}
+return false;
+"""
+
+BODY_TEXT_JS = "return document.body ? document.body.innerText : '';"
+
+# 资源请求数量与页面加载状态
+NETWORK_STATE_JS = "return [document.readyState, performance.getEntriesByType('resource').length];"
+
+def body_text(driver):
+    """页面可见文本 (等价于 body 元素的 .text，但不依赖 WebElement，可用于多标签页模式)"""
+    return driver.execute_script(BODY_TEXT_JS) or ""
+
+def wait_until(driver, predicate, timeout=20, poll=POLL_INTERVAL):
+    """轮询 predicate(driver) 直到为真，超时返回 False (不抛异常，由调用方决定是否继续解析)"""
+    try:
+        WebDriverWait(driver, timeout, poll_frequency=poll).until(predicate)
+        return True
+    except TimeoutException:
+        return False
+
+def table_ready(keyword_groups, min_rows=1, search_first_row=False):
+    """表头包含任一组关键字的表格已渲染出至少 min_rows 行数据"""
+    def predicate(driver):
+        return driver.execute_script(TABLE_READY_JS, keyword_groups, min_rows, search_first_row)
+    return predicate
+
+def text_matches(pattern, flags=re.IGNORECASE):
+    """页面可见文本匹配正则 (如 'TOTAL PUT/CALL RATIO' 后已出现数值)"""
+    regex = re.compile(pattern, flags)
+    def predicate(driver):
+        return bool(regex.search(re.sub(r'\s+', ' ', body_text(driver))))
+    return predicate
+
+def network_idle(quiet_seconds=0.5):
+    """文档已可交互，且资源请求数在 quiet_seconds 内不再增长"""
+    state = {"count": -1, "since": time.time()}
+    def predicate(driver):
+        ready, count = driver.execute_script(NETWORK_STATE_JS)
+        now = time.time()
+        if count != state["count"]:
+            state["count"], state["since"] = count, now
+            return False
+        return ready in ("interactive", "complete") and now - state["since"] >= quiet_seconds
+    return predicate
+
+def all_of(*predicates):
+    def predicate(driver):
+        return all(p(driver) for p in predicates)
+    return predicate
+
+def any_of(*predicates):
+    def predicate(driver):
+        return any(p(driver) for p in predicates)
+    return predicate
@@ -0,0 +1,93 @@
+# selenium_registry.py
+# -----------------------------------------------------------------------------
+# DeepSeek Finance Project - Macro Source Registry
+# 宏观数据源的声明式配置：抓取函数、接口直连、超时、重试次数、预期耗时与缓存策略，
+# 由 MacroDataScraper 统一调度 (预期耗时最长的页面最先提交)
+# -----------------------------------------------------------------------------
+
+import selenium_scrapers_investing as investing
+import selenium_scrapers_misc as misc
+import eastmoney_api
+import sentiment_api
+
+def source(scraper, timeout, retries, cost, api=None, http=None, api_cost=1, cache=False, **kwargs):
+    """
+    scraper: 浏览器抓取函数 (name, url, driver_pool, max_retries=, page_timeout=, **kwargs)
+    timeout / retries: 单页加载超时 (秒) 与最大尝试次数
+    cost: 浏览器抓取的预期耗时 (秒)，用于浏览器任务的最长处理时间优先 (LPT) 排序
+    api: 可选的接口直连函数 (name, days_to_keep) -> (name, records, error)，失败再回退 scraper
+    http: 可选的页面 HTTP 直连函数 (name, url, days_to_keep) -> (name, records, error)，失败再回退 scraper
+    api_cost: 直连路径的预期耗时 (秒)，只用于直连任务的排序，不影响浏览器任务
+    cache: 是否按 macro_cache.RELEASE_SCHEDULE 在下一个发布日前复用缓存
+    kwargs: 传给 scraper 的其他参数 (days_to_keep 等)
+    """
+    return {
+        "scraper": scraper, "timeout": timeout, "retries": retries, "cost": cost,
+        "api": api, "http": http, "api_cost": api_cost, "cache": cache, "kwargs": kwargs,
+    }
+
+def _eastmoney(name, days_to_keep=180, cache=True):
+    """Eastmoney 数据中心指标：有 JSON 接口的优先直连，其余走通用表格抓取"""
+    if name in eastmoney_api.ADAPTERS:
+        return source(misc.fetch_generic_source, 30, 5, 8, api=eastmoney_api.fetch_indicator, api_cost=2, cache=cache, days_to_keep=days_to_keep)
+    return source(misc.fetch_generic_source, 30, 5, 8, cache=cache, days_to_keep=days_to_keep)
+
+SOURCE_REGISTRY = {
+    # Eastmoney (接口直连 / 通用表格)
+    "中国_CPI": _eastmoney("中国_CPI"),
+    "中国_PMI": _eastmoney("中国_PMI"),
+    "中国_PPI": _eastmoney("中国_PPI"),
+    "中国_货币供应量": _eastmoney("中国_货币供应量"),
+    "中国_LPR": _eastmoney("中国_LPR"),
+    "美国_ISM制造业PMI": _eastmoney("美国_ISM制造业PMI"),
+    "美国_ISM非制造业指数": _eastmoney("美国_ISM非制造业指数"),
+    "美国_非农就业": _eastmoney("美国_非农就业"),
+    "美国_核心零售销售月率": _eastmoney("美国_核心零售销售月率"),
+    "美国_利率决议": _eastmoney("美国_利率决议"),
+    "日本_央行利率决议": _eastmoney("日本_央行利率决议"),
+
+    # Investing.com 历史数据 / 财经日历 / 利率监测
+    # 历史数据页与财经日历先以 HTTP 直连解析服务端渲染的表格，被拦截再回退浏览器
+    "恒生医疗保健指数": source(investing.fetch_investing_source, 60, 5, 30, http=investing.fetch_investing_http, api_cost=3),
+    "BDI_波罗的海指数": source(investing.fetch_investing_source, 60, 5, 30, http=investing.fetch_investing_http, api_cost=3, days_to_keep=10),
+    "CBOE_SKEW": source(investing.fetch_investing_source, 60, 5, 30, http=investing.fetch_investing_http, api_cost=3, days_to_keep=10),
+    "USA_Initial_Jobless": source(investing.fetch_investing_economic_calendar, 45, 3, 25, http=investing.fetch_calendar_http, api_cost=3, cache=True, days_to_keep=150),
+    "USA_ISM_New_Orders": source(investing.fetch_investing_economic_calendar, 45, 3, 25, http=investing.fetch_calendar_http, api_cost=3, cache=True, days_to_keep=365),
+    "Fed_Rate_Monitor": source(investing.fetch_fed_rate_monitor, 45, 3, 25),
+
+    # 其他来源
+    # CNN / CBOE 优先请求 JSON 接口，失败再回退浏览器 (回退页面加载较慢，cost 按页面估计)
+    "CNN_FearGreed": source(misc.fetch_cnn_fear_greed, 45, 5, 30, api=sentiment_api.fetch_cnn_fear_greed, api_cost=2),
+    "CBOE_PutCallRatio": source(misc.fetch_cboe_data, 45, 3, 30, api=sentiment_api.fetch_cboe_put_call, api_cost=3),
+    "CCFI_运价指数": source(misc.fetch_ccfi_data, 45, 3, 12, cache=True),
+    "Insider_BuySell_Ratio_USA": source(misc.fetch_gurufocus_insider_ratio, 60, 5, 20),
+}
+
+def get_source(name):
+    """未注册的数据源按 Eastmoney 通用表格处理 (南向资金只保留 30 天)"""
+    if name in SOURCE_REGISTRY:
+        return SOURCE_REGISTRY[name]
+    return _eastmoney(name, days_to_keep=30 if "南向资金" in name else 180, cache=False)
+
+def has_fast_path(name):
+    """是否有无需浏览器的直连路径 (接口 / HTTP)"""
+    spec = get_source(name)
+    return bool(spec["api"] or spec["http"])
+
+def fetch_fast_path(name, url):
+    """执行无需浏览器的直连路径，返回 (name, records, error)；没有直连路径时返回 None"""
+    spec = get_source(name)
+    days_to_keep = spec["kwargs"].get("days_to_keep", 180)
+    if spec["api"]:
+        return spec["api"](name, days_to_keep)
+    if spec["http"]:
+        return spec["http"](name, url, days_to_keep)
+    return None
+
+def schedule_order(names, fast=False):
+    """
+    最长处理时间优先: 预期耗时降序，慢页面先开始，避免它们最后才启动拖长整体耗时
+    fast=True 时按直连耗时 (api_cost) 排序直连任务，浏览器任务始终按页面耗时 (cost) 排序
+    """
+    field = "api_cost" if fast else "cost"
+    return sorted(names, key=lambda name: get_source(name)[field], reverse=True)
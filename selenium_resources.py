@@ -0,0 +1,135 @@
+# selenium_resources.py
+# -----------------------------------------------------------------------------
+# DeepSeek Finance Project - Browser Pool Sizing
+# 启动时按可用内存与 CPU 核数估算可同时运行的 Chrome 数量；
+# 单个 Chrome (含渲染进程) 的内存占用由 BrowserWatchdog 在运行中采样实测，持久化到状态目录供下次估算
+# -----------------------------------------------------------------------------
+
+import os
+import json
+from datetime import datetime
+from zoneinfo import ZoneInfo
+import utils
+
+TZ_CN = ZoneInfo("Asia/Shanghai")
+
+FOOTPRINT_FILENAME = "chrome_footprint.json"
+
+# MARKETRADAR_BROWSERS=N 固定浏览器数量 (跳过估算)
+BROWSERS_ENV = "MARKETRADAR_BROWSERS"
+MIN_BROWSERS = 1
+MAX_BROWSERS = max(MIN_BROWSERS, int(os.environ.get("MARKETRADAR_MAX_BROWSERS", "6")))
+
+DEFAULT_FOOTPRINT_MB = 600  # 尚无实测数据时单个 headless Chrome 的内存估计
+RESERVE_MB = 1536           # 为主进程、解析进程池与后续 K 线步骤预留的内存
+BROWSERS_PER_CPU = 1.5      # 页面加载大部分时间在等网络，每个核可承载多于 1 个浏览器
+FOOTPRINT_SMOOTHING = 0.5   # 新实测值的权重
+
+def cpu_count():
+    """可用 CPU 核数 (考虑 CPU 亲和性与 cgroup v2 的 cpu.max 配额)"""
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+    try:
+        with open("/sys/fs/cgroup/cpu.max", "r") as f:
+            quota, period = f.read().split()[:2]
+        if quota != "max":
+            cpus = min(cpus, max(1, int(int(quota) / int(period))))
+    except (OSError, ValueError):
+        pass
+    return cpus
+
+def available_memory_mb():
+    """
+    可用内存 (MB): /proc/meminfo 的 MemAvailable (含可回收缓存)，
+    容器内再与 cgroup v2 的 memory.max - memory.current 取较小值；无法读取时返回 None
+    """
+    available = None
+    try:
+        with open("/proc/meminfo", "r") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    available = int(line.split()[1]) / 1024
+                    break
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        with open("/sys/fs/cgroup/memory.max", "r") as f:
+            limit = f.read().strip()
+        if limit != "max":
+            with open("/sys/fs/cgroup/memory.current", "r") as f:
+                current = int(f.read().strip())
+            cgroup_available = (int(limit) - current) / 1024 / 1024
+            available = cgroup_available if available is None else min(available, cgroup_available)
+    except (OSError, ValueError):
+        pass
+    return available
+
+def process_memory_mb(pids):
+    """
+    一组进程的内存占用 (MB): 优先用 smaps_rollup 的 Pss (Chrome 多进程共享内存按比例分摊，不重复计算)，
+    不可用时退回 VmRSS；非 Linux 平台返回 0
+    """
+    total_kb = 0
+    for pid in pids:
+        for path, field in ((f"/proc/{pid}/smaps_rollup", "Pss:"), (f"/proc/{pid}/status", "VmRSS:")):
+            try:
+                with open(path, "r") as f:
+                    value = next((line.split()[1] for line in f if line.startswith(field)), None)
+            except OSError:
+                continue
+            if value is not None:
+                total_kb += int(value)
+                break
+    return total_kb / 1024
+
+def load_footprint():
+    """上次运行实测的单个 Chrome 内存 (MB)，无记录时返回默认估计"""
+    path = utils.state_path(FOOTPRINT_FILENAME)
+    if not os.path.exists(path):
+        return DEFAULT_FOOTPRINT_MB
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return float(json.load(f)["footprint_mb"]) or DEFAULT_FOOTPRINT_MB
+    except Exception:
+        return DEFAULT_FOOTPRINT_MB
+
+def save_footprint(measured_mb):
+    """将本次实测值与历史值平滑后写入状态目录，返回新的估计值"""
+    if not measured_mb:
+        return None
+    footprint = load_footprint()
+    footprint = round(footprint * (1 - FOOTPRINT_SMOOTHING) + measured_mb * FOOTPRINT_SMOOTHING, 1)
+    try:
+        path = utils.state_path(FOOTPRINT_FILENAME)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"footprint_mb": footprint, "measured_mb": round(measured_mb, 1),
+                       "updated_at": datetime.now(TZ_CN).strftime("%Y-%m-%d %H:%M:%S")}, f)
+        os.replace(tmp_path, path)
+    except Exception as e:
+        print(f"⚠️ Chrome 内存占用记录写入失败: {e}")
+    return footprint
+
+def recommend_browsers():
+    """
+    返回 (浏览器数量, 估算依据)
+    数量 = min((可用内存 - 预留) / 单个 Chrome 占用, CPU 核数 × BROWSERS_PER_CPU)，限制在 [MIN_BROWSERS, MAX_BROWSERS]
+    """
+    cpus = cpu_count()
+    available = available_memory_mb()
+    footprint = load_footprint()
+    detail = {"cpus": cpus, "available_mb": round(available) if available is not None else None,
+              "footprint_mb": footprint}
+
+    fixed = os.environ.get(BROWSERS_ENV)
+    if fixed:
+        detail["source"] = "环境变量"
+        return max(MIN_BROWSERS, int(fixed)), detail
+
+    by_cpu = int(cpus * BROWSERS_PER_CPU)
+    by_memory = int((available - RESERVE_MB) // footprint) if available is not None else by_cpu
+    size = max(MIN_BROWSERS, min(by_cpu, by_memory, MAX_BROWSERS))
+    detail.update({"by_cpu": by_cpu, "by_memory": by_memory, "source": "估算"})
+    return size, detail
@@ -6,126 +6,195 @@
 import time
 import pandas as pd
 import re
-from io import StringIO
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 import selenium_utils
+import selenium_capture
+import selenium_table
+import selenium_ready
+import selenium_parse
+import investing_client
 
-def fetch_investing_source(name, url, chrome_options, days_to_keep=180):
+# 历史数据页由 api.investing.com 的 JSON 接口填充表格
+INVESTING_HISTORICAL_PATTERN = r"api\.investing\.com/api/financialdata/historical/"
+
+# 就绪判断与表格定位共用的表头关键字
+HISTORICAL_TABLE_KEYWORDS = [['日期', '收盘'], ['Date', 'Price']]
+CALENDAR_TABLE_KEYWORDS = [['Release Date', 'Actual']]
+
+# 利率监测页的会议日期 (优先 "Meeting Time:")
+FED_DATE_EXTRACTOR = selenium_utils.LabelExtractor(
+    ["Meeting Time:", "Fed Interest Rate Decision"], r"[A-Za-z]{3}\s\d{1,2},\s\d{4}", r"\s*",
+)
+
+def _investing_json_to_df(payload):
+    """将历史数据 JSON 转为与 DOM 表格重命名后相同的列 (日期/close/open/high/low/volume/change_pct)"""
+    rows = payload.get("data") if isinstance(payload, dict) else None
+    if not rows:
+        return None
+
+    field_map = {
+        'close': ('last_closeRaw', 'last_close'),
+        'open': ('last_openRaw', 'last_open'),
+        'high': ('last_maxRaw', 'last_max'),
+        'low': ('last_minRaw', 'last_min'),
+        'volume': ('volumeRaw', 'volume'),
+        'change_pct': ('change_precentRaw', 'change_precent'),
+    }
+    records = []
+    for row in rows:
+        date_str = str(row.get('rowDateTimestamp') or '')[:10] or row.get('rowDate')
+        if not date_str:
+            continue
+        record = {'日期': date_str}
+        for col, (raw_key, text_key) in field_map.items():
+            record[col] = row.get(raw_key, row.get(text_key))
+        records.append(record)
+    return pd.DataFrame(records) if records else None
+
+# 统一列名 (中文 / 英文表头)
+HISTORY_RENAME_MAP = {
+    '日期': '日期', '收盘': 'close', '开盘': 'open',
+    '高': 'high', '低': 'low', '交易量': 'volume', '涨跌幅': 'change_pct',
+    'Date': '日期', 'Price': 'close', 'Open': 'open',
+    'High': 'high', 'Low': 'low', 'Vol.': 'volume', 'Change %': 'change_pct'
+}
+
+def _select_history_table(dfs):
+    """从表格列表中挑出历史数据表并统一列名"""
+    if not dfs:
+        raise ValueError("页面解析为空，未找到表格数据")
+
+    target_df = None
+
+    # 增强表头匹配逻辑
+    for df in dfs:
+        cols = [str(c).replace(" ", "").replace("\n", "").strip() for c in df.columns]
+        # Check for Chinese Headers
+        if all(k in cols for k in ['日期', '收盘']):
+            target_df = df
+            break
+        # Check for English Headers
+        if all(k in cols for k in ['Date', 'Price']):
+            target_df = df
+            break
+
+    if target_df is None:
+        # Fallback: check only date/close partials
+        for df in dfs:
+            cols = [str(c).strip() for c in df.columns]
+            if ('日期' in cols and '收盘' in cols) or ('Date' in cols and 'Price' in cols):
+                target_df = df
+                break
+
+    if target_df is None:
+        raise ValueError(f"未找到符合 Investing 格式的表格")
+
+    df = target_df.copy()
+
+    actual_cols = {}
+    for col in df.columns:
+        clean_col = str(col).strip()
+        if clean_col in HISTORY_RENAME_MAP:
+            actual_cols[col] = HISTORY_RENAME_MAP[clean_col]
+
+    return df.rename(columns=actual_cols)
+
+def _history_records(name, df, days_to_keep):
+    """日期标准化、按天数过滤、数值清洗，返回记录列表"""
+    df['_std_date'] = df['日期'].apply(selenium_utils.clean_investing_date)
+    df = df.dropna(subset=['_std_date'])
+    df['_std_date'] = pd.to_datetime(df['_std_date'])
+
+    # [修改] 数据回退机制：如果按日期过滤后为空，但原始数据不为空（说明数据过旧），则强制返回最新 N 条
+    df = df.sort_values(by='_std_date', ascending=False)
+
+    cutoff_date = pd.Timestamp.now() - pd.Timedelta(days=days_to_keep)
+    filtered_df = df[df['_std_date'] >= cutoff_date]
+
+    if filtered_df.empty and not df.empty:
+        latest_date_str = df.iloc[0]['_std_date'].strftime('%Y-%m-%d')
+        print(f"⚠️ [{name}] 数据过旧 (Latest: {latest_date_str})，超出 {days_to_keep} 天范围。自动回退: 返回最新 5 条。")
+        df = df.head(5)
+    else:
+        df = filtered_df
+
+    df['_std_date'] = df['_std_date'].dt.strftime('%Y-%m-%d')
+
+    if 'volume' in df.columns:
+        df['volume'] = df['volume'].apply(selenium_utils.parse_volume)
+    for col in ['close', 'open', 'high', 'low']:
+        if col in df.columns:
+            df[col] = df[col].astype(str).str.replace(',', '', regex=False)
+            df[col] = pd.to_numeric(df[col], errors='coerce')
+    if 'change_pct' in df.columns:
+        df['change_pct'] = df['change_pct'].apply(selenium_utils.parse_percentage)
+
+    keep_cols = ['_std_date'] + list(set(HISTORY_RENAME_MAP.values()))
+    final_cols = [c for c in keep_cols if c in df.columns]
+
+    df = df[final_cols]
+    df.rename(columns={'_std_date': '日期'}, inplace=True)
+
+    return df.to_dict('records')
+
+def _parse_history(name, payload, raw_tables, days_to_keep):
+    """解析阶段 (在解析进程中执行): 优先使用接口 JSON，否则从表格构造"""
+    df = _investing_json_to_df(payload) if payload else None
+    if df is None:
+        df = _select_history_table(selenium_table.to_frames(raw_tables))
+    else:
+        print(f"   ⚡ [{name}] 已从接口 JSON 获得 {len(df)} 行")
+    return _history_records(name, df, days_to_keep)
+
+def fetch_investing_http(name, url, days_to_keep=180):
     """
-    通用 Investing.com 历史数据抓取
-    支持中文/英文表头，支持页面滚动懒加载
+    HTTP 直连解析服务端渲染的历史数据表格 (无需浏览器)
+    返回: (name, records, error_msg)；被拦截或解析失败时由调度器回退到 fetch_investing_source
+    """
+    try:
+        html = investing_client.get_html(url)
+        records = selenium_parse.run(_parse_history, name, None, [{"html": html}], days_to_keep, source=name)
+        print(f"✅ [{name}] 抓取成功 (HTTP 直连)! 获得 {len(records)} 条记录")
+        return name, records, None
+    except Exception as e:
+        print(f"↗️ [{name}] HTTP 直连未成功: {str(e)[:100]}")
+        return name, [], str(e)
+
+def fetch_investing_source(name, url, driver_pool, days_to_keep=180, max_retries=5, page_timeout=60):
+    """
+    通用 Investing.com 历史数据抓取 (Selenium)
+    支持中文/英文表头，支持页面滚动懒加载；HTTP 直连见 fetch_investing_http
     """
-    max_retries = 5
     last_error = None
     
     for attempt in range(1, max_retries + 1):
         print(f"🌍 [{name}] 第 {attempt}/{max_retries} 次尝试 (Selenium - Investing专线)...")
         driver = None
         try:
-            driver = webdriver.Chrome(options=chrome_options)
-            driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {
-                "source": """Object.defineProperty(navigator, 'webdriver', {get: () => undefined})"""
-            })
+            driver = driver_pool.acquire(url)
 
-            driver.set_page_load_timeout(60)
-            driver.set_script_timeout(60)
+            driver.set_page_load_timeout(page_timeout)
+            driver.set_script_timeout(page_timeout)
             driver.get(url)
             
-            # [关键] 滚动页面以触发懒加载 (特别是对于 ICE/BDI/SKEW)
-            try:
-                driver.execute_script("window.scrollBy(0, 500);")
-                time.sleep(2)
-                WebDriverWait(driver, 20).until(EC.presence_of_element_located((By.TAG_NAME, "table")))
-            except:
-                pass
-            
-            html = driver.page_source
-            dfs = pd.read_html(StringIO(html))
-            
-            if not dfs:
-                raise ValueError("页面解析为空，未找到表格数据")
+            # 优先解析页面请求的历史数据 JSON，拿不到再走 DOM 表格解析
+            _, payload = selenium_capture.wait_for_json(driver, INVESTING_HISTORICAL_PATTERN, timeout=15)
+            raw_tables = []
 
-            target_df = None
-            
-            # 增强表头匹配逻辑
-            for df in dfs:
-                cols = [str(c).replace(" ", "").replace("\n", "").strip() for c in df.columns]
-                # Check for Chinese Headers
-                if all(k in cols for k in ['日期', '收盘']):
-                    target_df = df
-                    break
-                # Check for English Headers
-                if all(k in cols for k in ['Date', 'Price']):
-                    target_df = df
-                    break
-            
-            if target_df is None:
-                # Fallback: check only date/close partials
-                for df in dfs:
-                    cols = [str(c).strip() for c in df.columns]
-                    if ('日期' in cols and '收盘' in cols) or ('Date' in cols and 'Price' in cols):
-                        target_df = df
-                        break
-
-            if target_df is None:
-                    raise ValueError(f"未找到符合 Investing 格式的表格")
-
-            df = target_df.copy()
-            
-            # Standardize Column Names
-            rename_map = {
-                '日期': '日期', '收盘': 'close', '开盘': 'open',
-                '高': 'high', '低': 'low', '交易量': 'volume', '涨跌幅': 'change_pct',
-                'Date': '日期', 'Price': 'close', 'Open': 'open',
-                'High': 'high', 'Low': 'low', 'Vol.': 'volume', 'Change %': 'change_pct'
-            }
-            
-            actual_cols = {}
-            for col in df.columns:
-                clean_col = str(col).strip()
-                if clean_col in rename_map:
-                    actual_cols[col] = rename_map[clean_col]
-            
-            df = df.rename(columns=actual_cols)
-            
-            df['_std_date'] = df['日期'].apply(selenium_utils.clean_investing_date)
-            df = df.dropna(subset=['_std_date'])
-            df['_std_date'] = pd.to_datetime(df['_std_date'])
-            
-            # [修改] 数据回退机制：如果按日期过滤后为空，但原始数据不为空（说明数据过旧），则强制返回最新 N 条
-            df = df.sort_values(by='_std_date', ascending=False)
-            
-            cutoff_date = pd.Timestamp.now() - pd.Timedelta(days=days_to_keep)
-            filtered_df = df[df['_std_date'] >= cutoff_date]
-            
-            if filtered_df.empty and not df.empty:
-                latest_date_str = df.iloc[0]['_std_date'].strftime('%Y-%m-%d')
-                print(f"⚠️ [{name}] 数据过旧 (Latest: {latest_date_str})，超出 {days_to_keep} 天范围。自动回退: 返回最新 5 条。")
-                df = df.head(5)
-            else:
-                df = filtered_df
-            
-            df['_std_date'] = df['_std_date'].dt.strftime('%Y-%m-%d')
-            
-            if 'volume' in df.columns:
-                df['volume'] = df['volume'].apply(selenium_utils.parse_volume)
-            for col in ['close', 'open', 'high', 'low']:
-                if col in df.columns:
-                    df[col] = df[col].astype(str).str.replace(',', '', regex=False)
-                    df[col] = pd.to_numeric(df[col], errors='coerce')
-            if 'change_pct' in df.columns:
-                df['change_pct'] = df['change_pct'].apply(selenium_utils.parse_percentage)
-
-            keep_cols = ['_std_date'] + list(set(rename_map.values()))
-            final_cols = [c for c in keep_cols if c in df.columns]
-            
-            df = df[final_cols]
-            df.rename(columns={'_std_date': '日期'}, inplace=True)
+            if not (isinstance(payload, dict) and payload.get("data")):
+                # [关键] 滚动页面以触发懒加载 (特别是对于 ICE/BDI/SKEW)
+                try:
+                    driver.execute_script("window.scrollBy(0, 500);")
+                except:
+                    pass
+                selenium_ready.wait_until(driver, selenium_ready.table_ready(HISTORICAL_TABLE_KEYWORDS, min_rows=5), timeout=20)
             
-            records = df.to_dict('records')
+                raw_tables = selenium_table.extract(driver, HISTORICAL_TABLE_KEYWORDS, pick="first")
+
+            # 页面数据已取回，先归还浏览器再解析
+            driver_pool.release(driver)
+            driver = None
+
+            records = selenium_parse.run(_parse_history, name, payload, raw_tables, days_to_keep, source=name)
             print(f"✅ [{name}] 抓取成功! 获得 {len(records)} 条记录")
             return name, records, None 
 
@@ -136,83 +205,99 @@ def fetch_investing_source(name, url, chrome_options, days_to_keep=180):
                 time.sleep(2)
         finally:
             if driver:
-                try:
-                    driver.quit()
-                except:
-                    pass
+                driver_pool.release(driver)
     return name, [], last_error
 
-def fetch_investing_economic_calendar(name, url, chrome_options, days_to_keep=150):
+def _select_calendar_table(dfs):
+    """从表格列表中挑出财经日历表并统一列名"""
+    target_df = None
+    for df in dfs:
+        cols = [str(c).lower() for c in df.columns]
+        if any("release date" in c for c in cols) and any("actual" in c for c in cols):
+            target_df = df
+            break
+    
+    if target_df is None:
+        raise ValueError("未找到财经日历数据表格")
+    
+    df = target_df.copy()
+    new_cols = {}
+    for c in df.columns:
+        c_str = str(c).strip()
+        if "Release Date" in c_str: new_cols[c] = "Release Date"
+        elif "Actual" in c_str: new_cols[c] = "Actual"
+        elif "Forecast" in c_str: new_cols[c] = "Forecast"
+        elif "Previous" in c_str: new_cols[c] = "Previous"
+    
+    df.rename(columns=new_cols, inplace=True)
+
+    if 'Release Date' not in df.columns:
+        raise ValueError("列名识别失败")
+    return df
+
+def _calendar_records(df, days_to_keep):
+    def parse_calendar_date(x):
+        try:
+            x = re.sub(r'\(.*?\)', '', str(x)).strip()
+            return pd.to_datetime(x, format='%b %d, %Y')
+        except:
+            return pd.NaT
+
+    df['std_date'] = df['Release Date'].apply(parse_calendar_date)
+    df = df.dropna(subset=['std_date'])
+    
+    cutoff_date = pd.Timestamp.now() - pd.Timedelta(days=days_to_keep)
+    df = df[df['std_date'] >= cutoff_date]
+    
+    records = []
+    for _, row in df.iterrows():
+        records.append({
+            "日期": row['std_date'].strftime('%Y-%m-%d'),
+            "实际值": str(row.get('Actual', '')).strip(),
+            "预测值": str(row.get('Forecast', '')).strip(),
+            "前值": str(row.get('Previous', '')).strip()
+        })
+    return records
+
+def _parse_calendar(raw_tables, days_to_keep):
+    """解析阶段 (在解析进程中执行)"""
+    return _calendar_records(_select_calendar_table(selenium_table.to_frames(raw_tables)), days_to_keep)
+
+def fetch_calendar_http(name, url, days_to_keep=150):
+    """
+    HTTP 直连解析财经日历 (无需浏览器)
+    返回: (name, records, error_msg)；被拦截或解析失败时由调度器回退到 fetch_investing_economic_calendar
     """
-    抓取 Investing.com 财经日历数据
+    try:
+        html = investing_client.get_html(url)
+        records = selenium_parse.run(_parse_calendar, [{"html": html}], days_to_keep, source=name)
+        print(f"✅ [{name}] 抓取成功 (HTTP 直连)! 获得 {len(records)} 条记录 (近 {days_to_keep} 天)")
+        return name, records, None
+    except Exception as e:
+        print(f"↗️ [{name}] HTTP 直连未成功: {str(e)[:100]}")
+        return name, [], str(e)
+
+def fetch_investing_economic_calendar(name, url, driver_pool, days_to_keep=150, max_retries=3, page_timeout=45):
+    """
+    抓取 Investing.com 财经日历数据 (Selenium)；HTTP 直连见 fetch_calendar_http
     """
-    max_retries = 3
     last_error = None
     
     for attempt in range(1, max_retries + 1):
         print(f"🌍 [{name}] 第 {attempt}/{max_retries} 次尝试 (Selenium - Calendar)...")
         driver = None
         try:
-            driver = webdriver.Chrome(options=chrome_options)
-            driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {
-                "source": """Object.defineProperty(navigator, 'webdriver', {get: () => undefined})"""
-            })
-            driver.set_page_load_timeout(45)
+            driver = driver_pool.acquire(url)
+            driver.set_page_load_timeout(page_timeout)
             driver.get(url)
             
-            try:
-                WebDriverWait(driver, 20).until(EC.presence_of_element_located((By.TAG_NAME, "table")))
-            except:
-                pass
-            
-            html = driver.page_source
-            dfs = pd.read_html(StringIO(html))
+            selenium_ready.wait_until(driver, selenium_ready.table_ready(CALENDAR_TABLE_KEYWORDS, min_rows=3), timeout=20)
             
-            target_df = None
-            for df in dfs:
-                cols = [str(c).lower() for c in df.columns]
-                if any("release date" in c for c in cols) and any("actual" in c for c in cols):
-                    target_df = df
-                    break
-            
-            if target_df is None:
-                raise ValueError("未找到财经日历数据表格")
-            
-            df = target_df.copy()
-            new_cols = {}
-            for c in df.columns:
-                c_str = str(c).strip()
-                if "Release Date" in c_str: new_cols[c] = "Release Date"
-                elif "Actual" in c_str: new_cols[c] = "Actual"
-                elif "Forecast" in c_str: new_cols[c] = "Forecast"
-                elif "Previous" in c_str: new_cols[c] = "Previous"
-            
-            df.rename(columns=new_cols, inplace=True)
-            
-            def parse_calendar_date(x):
-                try:
-                    x = re.sub(r'\(.*?\)', '', str(x)).strip()
-                    return pd.to_datetime(x, format='%b %d, %Y')
-                except:
-                    return pd.NaT
-
-            if 'Release Date' not in df.columns:
-                raise ValueError("列名识别失败")
+            raw_tables = selenium_table.extract(driver, CALENDAR_TABLE_KEYWORDS, pick="first")
+            driver_pool.release(driver)
+            driver = None
 
-            df['std_date'] = df['Release Date'].apply(parse_calendar_date)
-            df = df.dropna(subset=['std_date'])
-            
-            cutoff_date = pd.Timestamp.now() - pd.Timedelta(days=days_to_keep)
-            df = df[df['std_date'] >= cutoff_date]
-            
-            records = []
-            for _, row in df.iterrows():
-                records.append({
-                    "日期": row['std_date'].strftime('%Y-%m-%d'),
-                    "实际值": str(row.get('Actual', '')).strip(),
-                    "预测值": str(row.get('Forecast', '')).strip(),
-                    "前值": str(row.get('Previous', '')).strip()
-                })
+            records = selenium_parse.run(_parse_calendar, raw_tables, days_to_keep, source=name)
             
             print(f"✅ [{name}] 抓取成功! 获得 {len(records)} 条记录 (近 {days_to_keep} 天)")
             return name, records, None
@@ -224,69 +309,68 @@ def fetch_investing_economic_calendar(name, url, chrome_options, days_to_keep=15
                 time.sleep(2)
         finally:
             if driver:
-                try:
-                    driver.quit()
-                except:
-                    pass
+                driver_pool.release(driver)
     return name, [], last_error
 
-def fetch_fed_rate_monitor(name, url, chrome_options):
+def _parse_fed_rate_monitor(body_text):
+    """解析阶段: 从页面文本提取会议日期与各利率区间概率"""
+    normalized_text = re.sub(r'\s+', ' ', body_text).strip()
+    
+    # 解析日期
+    meeting_date = "Unknown"
+    found = FED_DATE_EXTRACTOR.extract(normalized_text)
+    date_str = found.get("Meeting Time:") or found.get("Fed Interest Rate Decision")
+    if date_str:
+        meeting_date = date_str.strip()
+    
+    # 解析概率表
+    table_pattern = r"(\d+\.\d+\s*-\s*\d+\.\d+)\s+([\d\.]+%)\s+([\d\.]+%)\s+([\d\.]+%)(?:\s|$)"
+    matches = re.findall(table_pattern, normalized_text)
+    
+    if not matches:
+        raise ValueError("未匹配到利率概率表数据")
+
+    records = []
+    fetch_date = pd.Timestamp.now().strftime('%Y-%m-%d')
+    
+    for m in matches:
+        records.append({
+            "抓取日期": fetch_date,
+            "会议日期": meeting_date,
+            "目标利率区间": m[0],
+            "当前概率": m[1],
+            "前一日概率": m[2],
+            "前一周概率": m[3]
+        })
+    
+    return records
+
+def fetch_fed_rate_monitor(name, url, driver_pool, max_retries=3, page_timeout=45):
     """
     抓取 Investing.com Fed Rate Monitor Tool
     """
-    max_retries = 3
     last_error = None
     
     for attempt in range(1, max_retries + 1):
         print(f"🌍 [{name}] 第 {attempt}/{max_retries} 次尝试 (Selenium - FedRate)...")
         driver = None
         try:
-            driver = webdriver.Chrome(options=chrome_options)
-            driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {
-                "source": """Object.defineProperty(navigator, 'webdriver', {get: () => undefined})"""
-            })
-            driver.set_page_load_timeout(45)
+            driver = driver_pool.acquire(url)
+            driver.set_page_load_timeout(page_timeout)
             driver.get(url)
             
-            try:
-                WebDriverWait(driver, 20).until(
-                    EC.text_to_be_present_in_element((By.TAG_NAME, "body"), "Fed Interest Rate Decision")
-                )
-            except:
-                pass
-
-            body_text = driver.find_element(By.TAG_NAME, "body").text
-            normalized_text = re.sub(r'\s+', ' ', body_text).strip()
-            
-            # 解析日期
-            meeting_date = "Unknown"
-            date_match = re.search(r"Meeting Time:\s*([A-Za-z]{3}\s\d{1,2},\s\d{4})", normalized_text)
-            if not date_match:
-                date_match = re.search(r"Fed Interest Rate Decision\s*([A-Za-z]{3}\s\d{1,2},\s\d{4})", normalized_text)
-            if date_match:
-                meeting_date = date_match.group(1).strip()
-            
-            # 解析概率表
-            table_pattern = r"(\d+\.\d+\s*-\s*\d+\.\d+)\s+([\d\.]+%)\s+([\d\.]+%)\s+([\d\.]+%)(?:\s|$)"
-            matches = re.findall(table_pattern, normalized_text)
-            
-            if not matches:
-                raise ValueError("未匹配到利率概率表数据")
+            # 标题与至少一行概率数据均已渲染
+            selenium_ready.wait_until(driver, selenium_ready.all_of(
+                selenium_ready.text_matches(r"Fed Interest Rate Decision"),
+                selenium_ready.text_matches(r"\d+\.\d+\s*-\s*\d+\.\d+\s+[\d\.]+%"),
+            ), timeout=20)
 
-            records = []
-            fetch_date = pd.Timestamp.now().strftime('%Y-%m-%d')
-            
-            for m in matches:
-                records.append({
-                    "抓取日期": fetch_date,
-                    "会议日期": meeting_date,
-                    "目标利率区间": m[0],
-                    "当前概率": m[1],
-                    "前一日概率": m[2],
-                    "前一周概率": m[3]
-                })
-            
-            print(f"✅ [{name}] 抓取成功! 会议: {meeting_date}, 获得 {len(records)} 个区间数据")
+            body_text = selenium_ready.body_text(driver)
+            driver_pool.release(driver)
+            driver = None
+
+            records = selenium_parse.run(_parse_fed_rate_monitor, body_text, source=name)
+            print(f"✅ [{name}] 抓取成功! 会议: {records[0]['会议日期']}, 获得 {len(records)} 个区间数据")
             return name, records, None
 
         except Exception as e:
@@ -296,8 +380,5 @@ def fetch_fed_rate_monitor(name, url, chrome_options):
                 time.sleep(2)
         finally:
             if driver:
-                try:
-                    driver.quit()
-                except:
-                    pass
+                driver_pool.release(driver)
     return name, [], last_error
\ No newline at end of file
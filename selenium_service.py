@@ -0,0 +1,157 @@
+# selenium_service.py
+# -----------------------------------------------------------------------------
+# DeepSeek Finance Project - ChromeDriver Resolution
+# 每个进程只解析一次 chromedriver (及 Selenium Manager 给出的 Chrome) 路径，并缓存到状态目录跨运行复用；
+# 之后每个浏览器都用该路径构造 Service，webdriver.Chrome 不再逐次调用 Selenium Manager 探测版本
+# 缓存按 Chrome 版本 (chrome --version) 区分，Chrome 升级后自动重新解析；会话创建失败时丢弃缓存重试一次
+# -----------------------------------------------------------------------------
+
+import os
+import re
+import copy
+import json
+import shutil
+import threading
+import subprocess
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.common.driver_finder import DriverFinder
+import utils
+
+CACHE_FILENAME = "chromedriver_path.json"
+
+# MARKETRADAR_CHROMEDRIVER=/path/to/chromedriver 直接指定驱动 (优先级最高，不写缓存)
+DRIVER_PATH_ENV = "MARKETRADAR_CHROMEDRIVER"
+
+# 未指定 binary_location 时用于探测 Chrome 版本的可执行文件名
+CHROME_BINARIES = ("google-chrome", "google-chrome-stable", "chromium", "chromium-browser", "chrome")
+
+_LOCK = threading.Lock()
+_RESOLVED = None
+_SOURCE = None
+_RETRIED = False
+# prepare() 写入 options.binary_location 的浏览器路径 (重新解析时可被替换，不视为用户指定)
+_APPLIED = set()
+
+def _is_executable(path):
+    return bool(path) and os.path.isfile(path) and os.access(path, os.X_OK)
+
+def _browser_version(browser_path=None):
+    """Chrome 版本号 (chrome --version)，无法获取时返回 None"""
+    binary = browser_path or next(filter(None, (shutil.which(name) for name in CHROME_BINARIES)), None)
+    if not binary:
+        return None
+    try:
+        output = subprocess.run([binary, "--version"], capture_output=True, text=True, timeout=15).stdout
+    except (OSError, subprocess.SubprocessError):
+        return None
+    match = re.search(r"\d+(?:\.\d+)+", output)
+    return match.group(0) if match else None
+
+def _load_cached(browser_path=None):
+    path = utils.state_path(CACHE_FILENAME)
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            cached = json.load(f)
+    except Exception:
+        return None
+    # 驱动被升级/清理后缓存失效，重新解析
+    if not _is_executable(cached.get("driver_path")):
+        return None
+    if cached.get("browser_path") and not os.path.isfile(cached["browser_path"]):
+        return None
+    # Chrome 升级后旧驱动无法创建会话，版本不一致时重新解析
+    version = _browser_version(browser_path or cached.get("browser_path"))
+    if version != cached.get("browser_version"):
+        print(f"🔄 [Driver] Chrome 版本变化 ({cached.get('browser_version')} -> {version})，重新解析 chromedriver")
+        return None
+    return cached
+
+def _save_cached(paths):
+    try:
+        path = utils.state_path(CACHE_FILENAME)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(paths, f)
+        os.replace(tmp_path, path)
+    except Exception as e:
+        print(f"⚠️ chromedriver 路径缓存写入失败: {e}")
+
+def _resolve(options):
+    env_path = os.environ.get(DRIVER_PATH_ENV)
+    if _is_executable(env_path):
+        return {"driver_path": env_path, "browser_path": None}, "环境变量"
+
+    # 上次解析写入的浏览器路径不作为用户指定的 Chrome，避免按旧路径重新解析
+    user_binary = options.binary_location if options.binary_location not in _APPLIED else None
+    cached = _load_cached(user_binary)
+    if cached:
+        return cached, "磁盘缓存"
+
+    which_path = shutil.which("chromedriver")
+    if _is_executable(which_path):
+        paths = {"driver_path": which_path, "browser_path": None}
+        source = "PATH"
+    else:
+        finder_options = copy.deepcopy(options)
+        finder_options.binary_location = user_binary or ""
+        finder = DriverFinder(Service(), finder_options)
+        paths = {"driver_path": finder.get_driver_path(), "browser_path": finder.get_browser_path() or None}
+        source = "Selenium Manager"
+    paths["browser_version"] = _browser_version(user_binary or paths["browser_path"])
+    _save_cached(paths)
+    return paths, source
+
+def resolve(options):
+    """返回 {'driver_path', 'browser_path'}；同一进程内只解析一次 (失败也只尝试一次)"""
+    global _RESOLVED, _SOURCE
+    with _LOCK:
+        if _RESOLVED is None:
+            try:
+                paths, _SOURCE = _resolve(options)
+                print(f"🔧 [Driver] chromedriver: {paths['driver_path']} (来源: {_SOURCE})")
+            except Exception as e:
+                print(f"⚠️ [Driver] chromedriver 路径解析失败，交由 Selenium 默认流程: {str(e)[:100]}")
+                paths, _SOURCE = {"driver_path": None, "browser_path": None}, None
+            _RESOLVED = paths
+        return _RESOLVED
+
+def invalidate(service):
+    """
+    webdriver.Chrome 报 SessionNotCreatedException (驱动与 Chrome 版本不匹配) 时调用:
+    删除磁盘缓存并清空本进程的解析结果，每个进程只重新解析一次；返回是否值得用新解析的路径重试
+    """
+    global _RESOLVED, _RETRIED
+    stale = getattr(service, "path", None) if service else None
+    with _LOCK:
+        if not stale or _SOURCE == "环境变量":
+            return False
+        if _RESOLVED is not None and _RESOLVED["driver_path"] != stale:
+            # 其他线程已重新解析
+            return True
+        if _RETRIED:
+            return False
+        _RETRIED = True
+        try:
+            os.remove(utils.state_path(CACHE_FILENAME))
+        except OSError:
+            pass
+        _RESOLVED = None
+        print(f"🔄 [Driver] 会话创建失败，丢弃 chromedriver 缓存 ({stale}) 并重新解析")
+        return True
+
+def prepare(options):
+    """
+    为一个新浏览器构造 Service (每个 Chrome 各自启动一个 chromedriver 进程，Service 不能跨实例共享)
+    Selenium Manager 同时解析出了 Chrome 路径时写入 options，与 webdriver.Chrome 默认行为一致
+    解析失败时返回 None，由 webdriver.Chrome 按默认流程自行查找
+    """
+    paths = resolve(options)
+    if not paths["driver_path"]:
+        return None
+    if not options.binary_location or options.binary_location in _APPLIED:
+        options.binary_location = paths.get("browser_path") or ""
+        if options.binary_location:
+            _APPLIED.add(options.binary_location)
+    return Service(executable_path=paths["driver_path"])
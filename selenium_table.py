@@ -0,0 +1,128 @@
+# selenium_table.py
+# -----------------------------------------------------------------------------
+# DeepSeek Finance Project - In-Browser Table Extraction
+# 在页面内执行 JS，按表头关键字定位目标表格并只回传其单元格文本，
+# 再按 pd.read_html 相同的规则 (colspan/rowspan 展开、多级表头、千分位) 构造 DataFrame
+# -----------------------------------------------------------------------------
+
+import pandas as pd
+from io import StringIO
+from pandas.io.parsers import TextParser
+
+# arguments: [keyword_groups, pick, search_first_row]
+EXTRACT_TABLES_JS = r"""
+const groups = arguments[0] || [];
+const pick = arguments[1];
+const searchFirstRow = arguments[2];
+const norm = s => (s || '').replace(/[\r\n]+|\s{2,}/g, ' ').trim();
+const key = s => s.replace(/\s+/g, '').toLowerCase();
+
+function expand(rows) {
+    const out = [];
+    let pending = {};
+    for (const tr of rows) {
+        const line = [];
+        const next = {};
+        const cells = Array.from(tr.cells);
+        let col = 0, i = 0;
+        while (i < cells.length || pending[col]) {
+            if (pending[col]) {
+                const p = pending[col];
+                line.push(p.text);
+                if (p.left > 1) next[col] = {text: p.text, left: p.left - 1};
+                col++;
+                continue;
+            }
+            const cell = cells[i++];
+            const text = norm(cell.textContent);
+            const cs = Math.max(1, parseInt(cell.getAttribute('colspan')) || 1);
+            const rs = Math.max(1, parseInt(cell.getAttribute('rowspan')) || 1);
+            for (let k = 0; k < cs; k++) {
+                line.push(text);
+                if (rs > 1) next[col] = {text: text, left: rs - 1};
+                col++;
+            }
+        }
+        out.push(line);
+        pending = next;
+    }
+    return out;
+}
+
+const found = [];
+for (const table of document.querySelectorAll('table')) {
+    let head = table.tHead ? Array.from(table.tHead.rows) : [];
+    let body = [];
+    for (const tb of table.tBodies) body = body.concat(Array.from(tb.rows));
+    const foot = table.tFoot ? Array.from(table.tFoot.rows) : [];
+    if (!head.length) {
+        while (body.length && Array.from(body[0].cells).every(c => c.tagName === 'TH')) head.push(body.shift());
+    }
+    const grid = expand(head.concat(body, foot));
+    const headGrid = grid.slice(0, head.length);
+    const bodyGrid = grid.slice(head.length);
+    if (!bodyGrid.length && !headGrid.length) continue;
+
+    if (groups.length) {
+        const width = Math.max(0, ...headGrid.map(r => r.length));
+        const labels = [];
+        for (let c = 0; c < width; c++) labels.push(key(headGrid.map(r => r[c] || '').join('')));
+        if (searchFirstRow && bodyGrid.length) bodyGrid[0].forEach(t => labels.push(key(t)));
+        const ok = groups.some(g => g.every(k => labels.some(l => l.includes(key(k)))));
+        if (!ok) continue;
+    }
+    found.push({head: headGrid, body: bodyGrid});
+    if (pick === 'first') break;
+}
+if (pick === 'largest' && found.length > 1) {
+    found.sort((a, b) => b.body.length - a.body.length);
+    return found.slice(0, 1);
+}
+return found;
+"""
+
+def _to_frame(head, body):
+    """与 pandas.io.html._data_to_frame 一致的构造方式"""
+    header = None
+    rows = [list(r) for r in head + body]
+    if head:
+        if len(head) == 1:
+            header = 0
+        else:
+            header = [i for i, row in enumerate(head) if any(text for text in row)]
+    width = max((len(r) for r in rows), default=0)
+    for r in rows:
+        r.extend([""] * (width - len(r)))
+    with TextParser(rows, header=header, thousands=',') as tp:
+        return tp.read()
+
+def extract(driver, keyword_groups=None, pick="all", search_first_row=False):
+    """
+    在页面内定位表格，只取回单元格文本 (可 pickle，供解析进程使用)
+    keyword_groups: [[kw, ...], ...] 任一组关键字全部出现在表头 (忽略空白与大小写) 即视为匹配；None 表示不过滤
+    pick: "all" 全部匹配 / "first" 第一个匹配 / "largest" 行数最多的匹配
+    search_first_row: 表头识别失败时，同时在第一行数据中查找关键字
+    JS 执行失败时回退为整页 page_source (不做过滤)，返回 [{"html": ...}]
+    """
+    try:
+        return driver.execute_script(EXTRACT_TABLES_JS, keyword_groups or [], pick, search_first_row)
+    except Exception as e:
+        print(f"   ⚠️ 页面内表格提取失败，回退到 page_source 解析: {str(e)[:80]}")
+        return [{"html": driver.page_source}]
+
+def to_frames(raw_tables):
+    """将 extract 的结果转为 DataFrame 列表 (与 pd.read_html 的结果格式一致)"""
+    frames = []
+    for table in raw_tables:
+        if "html" in table:
+            try:
+                frames.extend(pd.read_html(StringIO(table["html"])))
+            except ValueError:
+                pass
+        else:
+            frames.append(_to_frame(table["head"], table["body"]))
+    return frames
+
+def read_tables(driver, keyword_groups=None, pick="all", search_first_row=False):
+    """在页面内定位表格并返回 DataFrame 列表 (参数同 extract)"""
+    return to_frames(extract(driver, keyword_groups, pick, search_first_row))
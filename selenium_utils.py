@@ -65,4 +65,30 @@ def parse_percentage(pct_str):
     try:
         return float(pct_str.replace('%', '').replace(',', ''))
     except:
-        return 0.0
\ No newline at end of file
+        return 0.0
+
+
+class LabelExtractor:
+    """
+    多标签单次扫描提取器: 将所有标签编译为一个交替正则，一次扫描文本得到全部 标签 -> 值 (每个标签取第一次出现)
+    标签按长度降序排列，同一位置优先匹配最长的标签；新增标签不增加扫描次数
+    """
+    def __init__(self, labels, value_pattern=r"[\d\.]+", separator=r"[:\s]+", flags=0):
+        self.ignore_case = bool(flags & re.IGNORECASE)
+        self.canonical = {self._key(label): label for label in labels}
+        alternation = "|".join(re.escape(label) for label in sorted(labels, key=len, reverse=True))
+        self.pattern = re.compile(f"(?P<label>{alternation}){separator}(?P<value>{value_pattern})", flags)
+
+    def _key(self, label):
+        return label.lower() if self.ignore_case else label
+
+    def extract(self, text):
+        """返回 {标签: 值字符串}，未出现的标签不在结果中"""
+        found = {}
+        for m in self.pattern.finditer(text):
+            label = self.canonical[self._key(m.group("label"))]
+            if label not in found:
+                found[label] = m.group("value")
+                if len(found) == len(self.canonical):
+                    break
+        return found
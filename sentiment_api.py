@@ -0,0 +1,153 @@
+# sentiment_api.py
+# -----------------------------------------------------------------------------
+# DeepSeek Finance Project - CNN Fear & Greed / CBOE Put-Call JSON Adapters
+# 两个页面的数据均由轻量 JSON 接口提供，这里直接请求，输出与 Selenium scraper 相同的记录格式；
+# 接口附带的历史数据持久化到状态目录，之后的运行只请求新增部分
+# -----------------------------------------------------------------------------
+
+import os
+import json
+import time
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+import fetch_data_core
+import selenium_scrapers_misc
+import page_archive
+import utils
+
+CNN_GRAPHDATA_URL = "https://production.dataviz.cnn.io/index/fearandgreed/graphdata"
+CBOE_DAILY_URL = "https://cdn.cboe.com/data/us/options/market_statistics/daily/{date}_daily_options"
+
+CNN_HISTORY_FILE = "cnn_fear_greed_history.json"
+CBOE_HISTORY_FILE = "cboe_put_call_history.json"
+HISTORY_DAYS = 400          # 本地历史保留天数
+CNN_OVERLAP_DAYS = 7        # 增量请求时与本地历史重叠的天数 (覆盖接口对近期数据的修订)
+CBOE_LOOKBACK_DAYS = 7      # 向前探测最近一个已发布交易日的天数
+TIMEOUT = 10
+
+TZ_NY = ZoneInfo("America/New_York")
+
+# 接口失败时尽快回退到 Selenium，不做过多重试
+SESSION = fetch_data_core.get_retry_session(retries=2)
+
+# dataviz.cnn.io 对非浏览器请求返回 418
+CNN_HEADERS = {
+    "Accept": "application/json, text/plain, */*",
+    "Origin": "https://edition.cnn.com",
+    "Referer": "https://edition.cnn.com/",
+}
+
+def _load_history(filename):
+    path = utils.state_path(filename)
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f).get("data", {})
+    except Exception as e:
+        print(f"⚠️ 历史数据读取失败 ({filename}): {e}")
+        return {}
+
+def _save_history(filename, data):
+    cutoff = (datetime.now(TZ_NY).date() - timedelta(days=HISTORY_DAYS)).isoformat()
+    data = {d: v for d, v in sorted(data.items()) if d >= cutoff}
+    payload = {"updated_at": datetime.now(TZ_NY).strftime("%Y-%m-%d %H:%M:%S"), "data": data}
+    try:
+        path = utils.state_path(filename)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(payload, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+    except Exception as e:
+        print(f"⚠️ 历史数据写入失败 ({filename}): {e}")
+
+def load_cnn_history():
+    """{日期: 恐惧贪婪指数}"""
+    return _load_history(CNN_HISTORY_FILE)
+
+def load_cboe_history():
+    """{日期: {指标: Put/Call Ratio}}"""
+    return _load_history(CBOE_HISTORY_FILE)
+
+def fetch_cnn_fear_greed(name, days_to_keep=None):
+    """
+    请求 graphdata 接口获取当前值与历史序列
+    本地已有历史时只请求最近一段 (URL 后缀为起始日期)
+    返回: (name, records, error_msg)，与 Selenium scraper 一致
+    """
+    start = time.time()
+    try:
+        history = load_cnn_history()
+        url = CNN_GRAPHDATA_URL
+        if history:
+            since = datetime.fromisoformat(max(history)).date() - timedelta(days=CNN_OVERLAP_DAYS)
+            url = f"{CNN_GRAPHDATA_URL}/{since.isoformat()}"
+
+        r = SESSION.get(url, headers=CNN_HEADERS, timeout=TIMEOUT)
+        r.raise_for_status()
+        payload = r.json()
+
+        page_archive.record(name, selenium_scrapers_misc._parse_cnn, (payload, None))
+        record = selenium_scrapers_misc._parse_cnn_graphdata(payload)
+        if not record:
+            raise ValueError("接口返回缺少 fear_and_greed.score")
+
+        points = (payload.get("fear_and_greed_historical") or {}).get("data") or []
+        for point in points:
+            if point.get("x") is None or point.get("y") is None:
+                continue
+            day = datetime.fromtimestamp(point["x"] / 1000, tz=timezone.utc).date().isoformat()
+            history[day] = round(float(point["y"]), 2)
+        if points:
+            _save_history(CNN_HISTORY_FILE, history)
+
+        print(f"⚡ [{name}] 接口直连成功! 当前值: {record['最新值']}，新增/更新历史 {len(points)} 天 ({time.time() - start:.2f}s)")
+        return name, [record], None
+    except Exception as e:
+        print(f"⚠️ [{name}] 接口直连失败: {str(e)[:100]}")
+        return name, [], str(e)
+
+def fetch_cboe_put_call(name, days_to_keep=None):
+    """
+    按日期从新到旧探测 CBOE 当日统计 JSON (尚未发布/休市日返回 403/404)
+    探测到已在本地历史中的日期时直接使用本地数据，不再请求
+    返回: (name, records, error_msg)，与 Selenium scraper 一致
+    """
+    start = time.time()
+    try:
+        history = load_cboe_history()
+        today = datetime.now(TZ_NY).date()
+        for offset in range(CBOE_LOOKBACK_DAYS):
+            day = today - timedelta(days=offset)
+            if day.weekday() >= 5:
+                continue
+            day_str = day.isoformat()
+            if day_str in history:
+                record = {"日期": day_str, **history[day_str]}
+                print(f"🗄️ [{name}] 最近交易日 {day_str} 已在本地历史中，跳过请求")
+                return name, [record], None
+
+            url = CBOE_DAILY_URL.format(date=day_str)
+            r = SESSION.get(url, timeout=TIMEOUT)
+            if r.status_code in (403, 404):
+                continue
+            r.raise_for_status()
+            payload = r.json()
+
+            page_archive.record(name, selenium_scrapers_misc._parse_cboe, (url, payload, None))
+            found = selenium_scrapers_misc._parse_cboe_daily_json(payload, selenium_scrapers_misc.CBOE_TARGET_KEYS)
+            if not any(v is not None for v in found.values()):
+                raise ValueError(f"{day_str} 统计中未找到 Put/Call Ratio 指标")
+            records = selenium_scrapers_misc._parse_cboe(url, payload, None)
+
+            history[day_str] = {k: v for k, v in records[0].items() if k != "日期"}
+            _save_history(CBOE_HISTORY_FILE, history)
+            found_count = sum(1 for v in found.values() if v is not None)
+            print(f"⚡ [{name}] 接口直连成功! 获得 {found_count} 个指标, 日期: {day_str} ({time.time() - start:.2f}s)")
+            return name, records, None
+
+        raise ValueError(f"最近 {CBOE_LOOKBACK_DAYS} 天均未找到已发布的日度统计")
+    except Exception as e:
+        print(f"⚠️ [{name}] 接口直连失败: {str(e)[:100]}")
+        return name, [], str(e)
@@ -5,30 +5,52 @@ import requests
 import json
 import os
 
+# 跨运行持久化状态目录 (并发调优、缓存等)，CI 中通过 actions/cache 保留
+STATE_DIR = os.environ.get("MARKETRADAR_STATE_DIR", ".marketradar_state")
+
+def state_path(*parts):
+    """返回状态目录下的文件路径，并确保父目录存在"""
+    path = os.path.join(STATE_DIR, *parts)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    return path
+
 def calculate_ma(df, windows=[5, 10, 20, 60, 120, 250]):
     """
-    计算移动平均线
+    计算移动平均线 (每个标的只取最新一日)
+    所有标的最近 max(windows) 个收盘价排成二维面板，各窗口均线取面板末尾 w 列的均值，一次算完全部标的与窗口；
+    与 rolling(window=w).mean() 的末值一致: 数据不足 w 条或窗口内有缺失值时为 None
     """
     if df is None or df.empty or 'close' not in df.columns:
         return []
 
     df = df.sort_values('date').copy()
     df['close'] = pd.to_numeric(df['close'], errors='coerce')
-    
-    if 'name' in df.columns:
-        groups = df.groupby('name')
-    else:
-        groups = [('Unknown', df)]
 
-    final_results = []
+    names_col = df['name'] if 'name' in df.columns else np.full(len(df), 'Unknown', dtype=object)
+    # 与 groupby('name') 一致: 按名称排序，名称缺失的行忽略
+    codes, names = pd.factorize(names_col, sort=True)
+    rows = np.flatnonzero(codes >= 0)
+    codes = codes[rows]
+    if len(rows) == 0:
+        return []
 
-    for name, group_df in groups:
-        if len(group_df) < 1:
-            continue
-            
-        latest_record = group_df.iloc[-1].to_dict()
-        
-        date_val = latest_record.get('date')
+    # 每行在所属标的中距最新一日的位置 (0 = 最新)，只保留面板需要的尾部
+    depth = max(max(windows, default=0), 2)
+    pos = pd.Series(codes).groupby(codes).cumcount(ascending=False).to_numpy()
+    keep = pos < depth
+    panel = np.full((len(names), depth), np.nan)
+    panel[codes[keep], depth - 1 - pos[keep]] = df['close'].to_numpy(dtype=float)[rows[keep]]
+
+    # 窗口内任一缺失 (含数据不足时的填充) 均值即为 NaN
+    ma_values = {w: panel[:, depth - w:].mean(axis=1) for w in windows}
+
+    latest_rows = np.empty(len(names), dtype=int)
+    latest_rows[codes[pos == 0]] = rows[pos == 0]
+    dates = df['date']
+
+    final_results = []
+    for g, name in enumerate(names):
+        date_val = dates.iloc[latest_rows[g]]
         if isinstance(date_val, pd.Timestamp):
             date_str = date_val.strftime('%Y-%m-%d')
         else:
@@ -36,30 +58,24 @@ def calculate_ma(df, windows=[5, 10, 20, 60, 120, 250]):
 
         # 计算涨跌幅 (相对于前一天)
         change_pct = 0.0
-        if len(group_df) >= 2:
-            prev_close = group_df['close'].iloc[-2]
-            curr_close = group_df['close'].iloc[-1]
-            if prev_close > 0:
-                change_pct = round((curr_close - prev_close) / prev_close * 100, 2)
+        prev_close = panel[g, -2]
+        curr_close = panel[g, -1]
+        if prev_close > 0:
+            change_pct = round((curr_close - prev_close) / prev_close * 100, 2)
 
         ma_data = {
             "名称": name,
             "日期": date_str,
-            "收盘价": round(latest_record.get('close'), 2),
+            "收盘价": round(float(curr_close), 2),
             "涨跌幅": f"{change_pct}%"
         }
 
         for w in windows:
-            col_name = f"{w}日均线"
-            ma_series = group_df['close'].rolling(window=w).mean()
-            latest_ma = ma_series.iloc[-1]
-            if pd.notna(latest_ma):
-                ma_data[col_name] = round(latest_ma, 2)
-            else:
-                ma_data[col_name] = None
+            latest_ma = ma_values[w][g]
+            ma_data[f"{w}日均线"] = round(latest_ma, 2) if pd.notna(latest_ma) else None
 
         final_results.append(ma_data)
-        
+
     return final_results
 
 def send_to_feishu(webhook_url, report_data):